@@ -0,0 +1,108 @@
+import asyncio
+import heapq
+import itertools
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Lower value = served first
+PRIORITY_CACHED = 0
+PRIORITY_ENRICH = 1
+
+
+class Overloaded(Exception):
+    """Raised when a request cannot be admitted (queue full or queue deadline passed)"""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Caps in-flight pipelines and keeps a bounded, prioritised wait queue.
+
+    Requests beyond `max_concurrent` wait in a queue of at most `max_queue`
+    entries for up to `queue_timeout` seconds. When the queue is full, a
+    higher-priority arrival displaces the newest lowest-priority waiter;
+    otherwise the arrival is rejected immediately.
+    """
+
+    def __init__(self, max_concurrent: int, max_queue: int, queue_timeout: float, retry_after: int = 1):
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self._active = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def _remove_waiter(self, future: asyncio.Future) -> None:
+        self._waiters = [w for w in self._waiters if w[2] is not future]
+        heapq.heapify(self._waiters)
+
+    def _make_room(self, priority: int) -> None:
+        """Free a queue slot for `priority`, or raise Overloaded if nothing can be shed"""
+        # Waiters that timed out or were cancelled may not have removed themselves yet
+        self._waiters = [w for w in self._waiters if not w[2].done()]
+        heapq.heapify(self._waiters)
+        if len(self._waiters) < self.max_queue:
+            return
+        if self._waiters:
+            victim = max(self._waiters)
+            if victim[0] > priority:
+                self._remove_waiter(victim[2])
+                victim[2].set_exception(Overloaded("Displaced by higher-priority request", self.retry_after))
+                return
+        raise Overloaded("Server is at capacity", self.retry_after)
+
+    async def acquire(self, priority: int = PRIORITY_ENRICH) -> None:
+        if self._active < self.max_concurrent and not self._waiters:
+            self._active += 1
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            self._make_room(priority)
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), future))
+        try:
+            # The releasing request hands its slot over by resolving the future
+            await asyncio.wait_for(future, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._remove_waiter(future)
+            raise Overloaded("Timed out waiting in queue", self.retry_after)
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                self.release()
+            else:
+                self._remove_waiter(future)
+            raise
+
+    def release(self) -> None:
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._active -= 1
+
+    @asynccontextmanager
+    async def slot(self, priority: int = PRIORITY_ENRICH) -> AsyncIterator[None]:
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
@@ -0,0 +1,57 @@
+"""Compare the validated and fast response serialization paths.
+
+Usage: python bench_serialization.py [iterations]
+"""
+import gzip
+import sys
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from main import DrugResponse, build_drug_response, canonical_drug_key
+from serialization import dumps_json, project_drug_response
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+SAMPLE_DRUG_SETS = [
+    ['ibuprofen'],
+    ['sertraline', 'ibuprofen', 'melatonin'],
+    ['metformin', 'insulin', 'amlodipine', 'simvastatin', 'grapefruit', 'warfarin', 'naproxen'],
+]
+
+
+def standard_path(result):
+    """What FastAPI does for a dict returned under response_model"""
+    validated = DrugResponse.model_validate(result)
+    return JSONResponse(content=jsonable_encoder(validated)).body
+
+
+def fast_path(result):
+    return dumps_json(project_drug_response(result))
+
+
+def cpu_time(fn, result, iterations):
+    start = time.process_time()
+    for _ in range(iterations):
+        fn(result)
+    return (time.process_time() - start) / iterations * 1e6
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    print(f"{'drugs':>5} {'path':>8} {'bytes':>7} {'gzip':>7} {'brotli':>7} {'cpu us':>9}")
+    for drugs in SAMPLE_DRUG_SETS:
+        result = build_drug_response(canonical_drug_key(drugs))
+        for name, fn in (('standard', standard_path), ('fast', fast_path)):
+            body = fn(result)
+            brotli_size = len(brotli.compress(body)) if brotli is not None else '-'
+            print(f"{len(drugs):>5} {name:>8} {len(body):>7} {len(gzip.compress(body)):>7} "
+                  f"{brotli_size:>7} {cpu_time(fn, result, iterations):>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+import threading
+import time
+
+
+class LRUCache:
+    """Small thread-safe in-memory LRU cache with optional per-entry TTLs"""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and (entry[1] is None or entry[1] > time.monotonic())
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        with self._lock:
+            try:
+                value, expires_at = self._data[key]
+            except KeyError:
+                return default
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class TieredCache:
+    """In-memory LRU in front of a slower shared store (e.g. DiskCache)"""
+
+    def __init__(self, memory: LRUCache, store):
+        self.memory = memory
+        self.store = store
+
+    def get(self, key: str, default: Optional[Any] = None) -> Any:
+        value = self.memory.get(key)
+        if value is not None:
+            return value
+        if self.store is None:
+            return default
+        entry = self.store.get_entry(key)
+        if entry is None:
+            return default
+        value, expires_at = entry
+        # Promoted entries expire from memory when they expire from the store
+        self.memory.put(key, value, ttl=expires_at - time.time())
+        return value
+
+    def put(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        if self.store is not None:
+            # Without an explicit ttl the store applies its default; memory must not outlive it
+            if ttl is None:
+                ttl = self.store.default_ttl
+            self.store.put(key, value, ttl)
+        self.memory.put(key, value, ttl)
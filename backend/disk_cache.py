@@ -0,0 +1,125 @@
+from typing import Any, Optional, Tuple
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+"""
+
+
+class DiskCache:
+    """Host-wide JSON value cache in SQLite with TTLs and a size bound.
+
+    WAL mode plus a busy timeout lets every worker process on the host read
+    and write the same file concurrently. Each thread gets its own
+    connection. Once the stored values exceed `max_bytes`, the least
+    recently read entries are evicted. Read times are only written back
+    when older than `touch_interval` seconds, so hot reads stay read-only
+    and do not contend for the write lock. A new directory is created private
+    (0700) and a new database file owner-only (0600), since cached values
+    are served back to users.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 64 * 1024 * 1024, default_ttl: float = 86400,
+                 evict_every: int = 100, touch_interval: float = 60):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.evict_every = evict_every
+        self.touch_interval = touch_interval
+        self._local = threading.local()
+        self._writes = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        # SQLite gives the -wal and -shm files the same permissions as the database
+        os.close(os.open(path, os.O_RDWR | os.O_CREAT, 0o600))
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str, default: Optional[Any] = None) -> Any:
+        entry = self.get_entry(key)
+        return default if entry is None else entry[0]
+
+    def get_entry(self, key: str) -> Optional[Tuple[Any, float]]:
+        """Return (value, expires_at) for a live entry, or None"""
+        now = time.time()
+        try:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT value, expires_at, accessed_at FROM entries WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[2] >= self.touch_interval:
+                conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+            return json.loads(row[0]), row[1]
+        except sqlite3.Error as e:
+            logger.error(f"Disk cache read failed: {str(e)}")
+            return None
+
+    def put(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        now = time.time()
+        data = json.dumps(value).encode("utf-8")
+        expires_at = now + (self.default_ttl if ttl is None else ttl)
+        try:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, data, len(data), expires_at, now)
+            )
+        except sqlite3.Error as e:
+            logger.error(f"Disk cache write failed: {str(e)}")
+            return
+        self._writes += 1
+        if self._writes % self.evict_every == 0:
+            self.evict()
+
+    def evict(self) -> None:
+        """Drop expired entries, then least recently read ones until under max_bytes"""
+        try:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("DELETE FROM entries WHERE expires_at <= ?", (time.time(),))
+                total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+                if total > self.max_bytes:
+                    excess = total - self.max_bytes
+                    rows = conn.execute("SELECT key, size FROM entries ORDER BY accessed_at").fetchall()
+                    victims = []
+                    for key, size in rows:
+                        if excess <= 0:
+                            break
+                        victims.append((key,))
+                        excess -= size
+                    conn.executemany("DELETE FROM entries WHERE key = ?", victims)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as e:
+            logger.error(f"Disk cache eviction failed: {str(e)}")
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
@@ -1,13 +1,58 @@
 import requests
 import logging
 import openai
-from typing import Dict, Any, Tuple, List, Optional
+from typing import Dict, Any, Tuple, List, NamedTuple, Optional
+from enum import IntEnum
+import difflib
+import hashlib
+import json
+import os
 import re
+import threading
+from ner import drug_ner
+from cache import LRUCache, TieredCache
+from disk_cache import DiskCache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Second-level cache for slow enrichment results, shared by all workers on the host.
+# Memory only unless DISK_CACHE_PATH points at a database in a directory only this service can write.
+DISK_CACHE_PATH = os.getenv("DISK_CACHE_PATH", "")
+DISK_CACHE_MAX_BYTES = int(os.getenv("DISK_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+AI_CACHE_TTL = float(os.getenv("AI_CACHE_TTL", 7 * 24 * 3600))
+
+_enrichment_cache: Optional[TieredCache] = None
+_enrichment_cache_lock = threading.Lock()
+
+def create_enrichment_cache() -> TieredCache:
+    store = None
+    if DISK_CACHE_PATH:
+        try:
+            store = DiskCache(DISK_CACHE_PATH, max_bytes=DISK_CACHE_MAX_BYTES, default_ttl=AI_CACHE_TTL)
+        except Exception as e:
+            logger.error(f"Disk cache unavailable, using memory only: {str(e)}")
+    return TieredCache(LRUCache(maxsize=256), store)
+
+_openai_client: Optional[openai.OpenAI] = None
+
+def get_openai_client() -> Optional[openai.OpenAI]:
+    """Shared OpenAI client, or None when no API key is configured"""
+    global _openai_client
+    if _openai_client is None and openai.api_key:
+        _openai_client = openai.OpenAI(api_key=openai.api_key)
+    return _openai_client
+
+def get_enrichment_cache() -> TieredCache:
+    """The process-wide enrichment cache, opened on first use"""
+    global _enrichment_cache
+    if _enrichment_cache is None:
+        with _enrichment_cache_lock:
+            if _enrichment_cache is None:
+                _enrichment_cache = create_enrichment_cache()
+    return _enrichment_cache
+
 # Common drug name mappings
 DRUG_MAPPINGS = {
     # Pain relievers
@@ -346,6 +391,226 @@ COMMON_DRUG_INFO = {
     }
 }
 
+# Strict list of known drugs and their aliases
+DRUG_ALIASES = {
+    'sertraline': 'sertraline',
+    'zoloft': 'sertraline',
+    'melatonin': 'melatonin',
+    'ibuprofen': 'ibuprofen',
+    'advil': 'ibuprofen',
+    'motrin': 'ibuprofen',
+    'brufen': 'ibuprofen',
+    'nurofen': 'ibuprofen',
+    'metformin': 'metformin',
+    'glucophage': 'metformin',
+    'insulin': 'insulin',
+    'alcohol': 'alcohol',
+    'ethanol': 'alcohol',
+    'drinking': 'alcohol',
+    'beer': 'alcohol',
+    'wine': 'alcohol',
+    'liquor': 'alcohol',
+    'drink': 'alcohol',
+    'drinks': 'alcohol',
+    'alcoholic': 'alcohol',
+    'alcoholic beverage': 'alcohol',
+    'alcoholic beverages': 'alcohol',
+    'aspirin': 'aspirin',
+    'bayer': 'aspirin',
+    'bufferin': 'aspirin',
+    'ecotrin': 'aspirin',
+    'acetaminophen': 'acetaminophen',
+    'tylenol': 'acetaminophen',
+    'paracetamol': 'acetaminophen',
+    'panadol': 'acetaminophen',
+    'amlodipine': 'amlodipine',
+    'norvasc': 'amlodipine',
+    'simvastatin': 'simvastatin',
+    'zocor': 'simvastatin',
+    'grapefruit': 'grapefruit',
+    'grapefruit juice': 'grapefruit',
+    'atorvastatin': 'atorvastatin',
+    'lipitor': 'atorvastatin',
+    'amoxicillin': 'amoxicillin',
+    'amoxil': 'amoxicillin',
+    'warfarin': 'warfarin',
+    'coumadin': 'warfarin',
+    'cetirizine': 'cetirizine',
+    'zyrtec': 'cetirizine',
+    'loratadine': 'loratadine',
+    'claritin': 'loratadine',
+    'naproxen': 'naproxen',
+    'aleve': 'naproxen',
+    'cbd': 'cbd',
+    'cbd oil': 'cbd',
+    'cannabidiol': 'cbd',
+    'birth control': 'birth_control',
+    'oral contraceptive': 'birth_control',
+    'contraceptive': 'birth_control',
+    'birth control pills': 'birth_control',
+    'the pill': 'birth_control',
+    'birthcontrol': 'birth_control',
+    'antibiotics': 'antibiotics',
+    'antibiotic': 'antibiotics',
+    'mao inhibitor': 'mao_inhibitors',
+    'mao inhibitors': 'mao_inhibitors',
+    'blood thinner': 'blood_thinners',
+    'blood thinners': 'blood_thinners',
+    'anticoagulant': 'blood_thinners',
+    'anticoagulants': 'blood_thinners',
+    'blood pressure medication': 'blood_pressure_meds',
+    'blood pressure med': 'blood_pressure_meds',
+    'blood pressure medicine': 'blood_pressure_meds',
+    'metoprolol': 'metoprolol',
+    'lopressor': 'metoprolol',
+    'toprol': 'metoprolol',
+    'dementia medication': 'dementia_meds',
+    'dementia med': 'dementia_meds',
+    'dementia medicine': 'dementia_meds'
+}
+
+# Strict list of known drugs and their variations
+DRUG_VARIATIONS = {
+    'sertraline': ['sertraline', 'zoloft'],
+    'melatonin': ['melatonin'],
+    'ibuprofen': ['ibuprofen', 'advil', 'motrin', 'brufen', 'nurofen'],
+    'metformin': ['metformin', 'glucophage'],
+    'insulin': ['insulin'],
+    'alcohol': ['alcohol', 'ethanol', 'drinking', 'beer', 'wine', 'liquor', 'drink', 'drinks', 'alcoholic', 'alcoholic beverage', 'alcoholic beverages'],
+    'aspirin': ['aspirin', 'bayer', 'bufferin', 'ecotrin'],
+    'acetaminophen': ['acetaminophen', 'tylenol', 'paracetamol', 'panadol'],
+    'amlodipine': ['amlodipine', 'norvasc'],
+    'simvastatin': ['simvastatin', 'zocor'],
+    'grapefruit': ['grapefruit', 'grapefruit juice'],
+    'atorvastatin': ['atorvastatin', 'lipitor'],
+    'amoxicillin': ['amoxicillin', 'amoxil'],
+    'warfarin': ['warfarin', 'coumadin'],
+    'cetirizine': ['cetirizine', 'zyrtec'],
+    'loratadine': ['loratadine', 'claritin'],
+    'naproxen': ['naproxen', 'aleve'],
+    'cbd': ['cbd', 'cbd oil', 'cannabidiol'],
+    'birth_control': ['birth control', 'oral contraceptive', 'contraceptive', 'birth control pills', 'the pill', 'birthcontrol'],
+    'antibiotics': ['antibiotics', 'antibiotic'],
+    'mao_inhibitors': ['mao inhibitor', 'mao inhibitors'],
+    'blood_thinners': ['blood thinner', 'blood thinners', 'anticoagulant', 'anticoagulants'],
+    'blood_pressure_meds': ['blood pressure medication', 'blood pressure med', 'blood pressure medicine'],
+    'metoprolol': ['metoprolol', 'lopressor', 'toprol'],
+    'dementia_meds': ['dementia medication', 'dementia med', 'dementia medicine']
+}
+
+# Terms treated as alcohol when checking a single pair
+ALCOHOL_TERMS = frozenset(DRUG_VARIATIONS['alcohol'])
+
+# Content hash of the knowledge base; changes whenever any drug entry changes
+KNOWLEDGE_BASE_VERSION = hashlib.sha256(
+    json.dumps(COMMON_DRUG_INFO, sort_keys=True).encode('utf-8')
+).hexdigest()[:16]
+
+class Severity(IntEnum):
+    """Interaction severity; higher is more serious"""
+    NONE = 0
+    CAUTION = 1
+    WARNING = 2
+
+SEVERITY_LABELS = {
+    Severity.NONE: 'none',
+    Severity.CAUTION: 'moderate',
+    Severity.WARNING: 'high',
+}
+
+SEVERITY_BY_LABEL = {label: severity for severity, label in SEVERITY_LABELS.items()}
+
+class Interaction(NamedTuple):
+    """An interaction entry parsed once when the knowledge base is loaded"""
+    drug: str
+    other: str
+    message: str
+    severity: Severity
+    mechanism: str
+    recommendation: str
+
+SEVERITY_PREFIX = re.compile(r'^\s*(WARNING|CAUTION)\s*:\s*', re.IGNORECASE)
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+def parse_interaction(drug: str, other: str, message: str) -> Interaction:
+    """Split an interaction message into severity, mechanism and recommendation"""
+    if 'WARNING' in message:
+        severity = Severity.WARNING
+    elif message.lower().startswith('no significant interaction'):
+        severity = Severity.NONE
+    else:
+        severity = Severity.CAUTION
+
+    sentences = SENTENCE_END.split(SEVERITY_PREFIX.sub('', message), maxsplit=1)
+    mechanism = sentences[0]
+    recommendation = sentences[1] if len(sentences) > 1 else ''
+    return Interaction(drug, other, message, severity, mechanism, recommendation)
+
+def build_interaction_index() -> Dict[Tuple[str, str], Interaction]:
+    """Index every interaction entry by (drug, other drug)"""
+    return {
+        (drug, other): parse_interaction(drug, other, message)
+        for drug, info in COMMON_DRUG_INFO.items()
+        for other, message in info.get('interactions', {}).items()
+    }
+
+def build_pair_index(index: Dict[Tuple[str, str], Interaction]) -> Dict[Tuple[str, str], Interaction]:
+    """Symmetric pair lookup: each ordered pair maps to drug1's own entry, or drug2's if drug1 has none"""
+    pairs = {(other, drug): interaction for (drug, other), interaction in index.items()}
+    pairs.update(index)
+    return pairs
+
+INTERACTION_INDEX = build_interaction_index()
+PAIR_INDEX = build_pair_index(INTERACTION_INDEX)
+
+def find_interaction(drug1: str, drug2: str) -> Optional[Interaction]:
+    """Interaction between two canonical drugs, preferring drug1's own entry"""
+    return PAIR_INDEX.get((drug1, drug2))
+
+def build_interaction_matrix(drugs: List[str]) -> Dict[str, Any]:
+    """N x N severity matrix for canonical drugs in one pass over the pair index.
+
+    Cells hold integer Severity codes (`severity_labels` is indexed by code);
+    `message_ids` points into a
+    deduplicated `messages` table (-1 where there is no interaction).
+    """
+    size = len(drugs)
+    severity = [[0] * size for _ in range(size)]
+    message_ids = [[-1] * size for _ in range(size)]
+    messages: List[str] = []
+    message_lookup: Dict[str, int] = {}
+
+    for i, drug1 in enumerate(drugs):
+        for j in range(i + 1, size):
+            interaction = PAIR_INDEX.get((drug1, drugs[j]))
+            if interaction is None:
+                continue
+            message_id = message_lookup.get(interaction.message)
+            if message_id is None:
+                message_id = message_lookup[interaction.message] = len(messages)
+                messages.append(interaction.message)
+            severity[i][j] = severity[j][i] = int(interaction.severity)
+            message_ids[i][j] = message_ids[j][i] = message_id
+
+    return {
+        'drugs': drugs,
+        'severity_labels': [SEVERITY_LABELS[code] for code in Severity],
+        'severity': severity,
+        'message_ids': message_ids,
+        'messages': messages
+    }
+
+def get_interactions(drugs: List[str], min_severity: Severity = Severity.NONE) -> List[Interaction]:
+    """All pairwise interactions between drugs, most severe first"""
+    found = []
+    for i, drug1 in enumerate(drugs):
+        for drug2 in drugs[i+1:]:
+            interaction = find_interaction(drug1, drug2)
+            if interaction is not None and interaction.severity >= min_severity:
+                found.append(interaction)
+    found.sort(key=lambda interaction: interaction.severity, reverse=True)
+    return found
+
 def normalize_drug_name(drug_name: str) -> str:
     """Normalize drug name to standard form"""
     if not drug_name or not isinstance(drug_name, str):
@@ -353,132 +618,34 @@ def normalize_drug_name(drug_name: str) -> str:
         
     drug_name = drug_name.lower().strip()
     
-    # Strict list of known drugs and their variations
-    drug_mappings = {
-        'sertraline': 'sertraline',
-        'zoloft': 'sertraline',
-        'melatonin': 'melatonin',
-        'ibuprofen': 'ibuprofen',
-        'advil': 'ibuprofen',
-        'motrin': 'ibuprofen',
-        'brufen': 'ibuprofen',
-        'nurofen': 'ibuprofen',
-        'metformin': 'metformin',
-        'glucophage': 'metformin',
-        'insulin': 'insulin',
-        'alcohol': 'alcohol',
-        'ethanol': 'alcohol',
-        'drinking': 'alcohol',
-        'beer': 'alcohol',
-        'wine': 'alcohol',
-        'liquor': 'alcohol',
-        'drink': 'alcohol',
-        'drinks': 'alcohol',
-        'alcoholic': 'alcohol',
-        'alcoholic beverage': 'alcohol',
-        'alcoholic beverages': 'alcohol',
-        'aspirin': 'aspirin',
-        'bayer': 'aspirin',
-        'bufferin': 'aspirin',
-        'ecotrin': 'aspirin',
-        'acetaminophen': 'acetaminophen',
-        'tylenol': 'acetaminophen',
-        'paracetamol': 'acetaminophen',
-        'panadol': 'acetaminophen',
-        'amlodipine': 'amlodipine',
-        'norvasc': 'amlodipine',
-        'simvastatin': 'simvastatin',
-        'zocor': 'simvastatin',
-        'grapefruit': 'grapefruit',
-        'grapefruit juice': 'grapefruit',
-        'atorvastatin': 'atorvastatin',
-        'lipitor': 'atorvastatin',
-        'amoxicillin': 'amoxicillin',
-        'amoxil': 'amoxicillin',
-        'warfarin': 'warfarin',
-        'coumadin': 'warfarin',
-        'cetirizine': 'cetirizine',
-        'zyrtec': 'cetirizine',
-        'loratadine': 'loratadine',
-        'claritin': 'loratadine',
-        'naproxen': 'naproxen',
-        'aleve': 'naproxen',
-        'cbd': 'cbd',
-        'cbd oil': 'cbd',
-        'cannabidiol': 'cbd',
-        'birth control': 'birth_control',
-        'oral contraceptive': 'birth_control',
-        'contraceptive': 'birth_control',
-        'birth control pills': 'birth_control',
-        'the pill': 'birth_control',
-        'birthcontrol': 'birth_control',
-        'antibiotics': 'antibiotics',
-        'antibiotic': 'antibiotics',
-        'mao inhibitor': 'mao_inhibitors',
-        'mao inhibitors': 'mao_inhibitors',
-        'blood thinner': 'blood_thinners',
-        'blood thinners': 'blood_thinners',
-        'anticoagulant': 'blood_thinners',
-        'anticoagulants': 'blood_thinners',
-        'blood pressure medication': 'blood_pressure_meds',
-        'blood pressure med': 'blood_pressure_meds',
-        'blood pressure medicine': 'blood_pressure_meds',
-        'metoprolol': 'metoprolol',
-        'lopressor': 'metoprolol',
-        'toprol': 'metoprolol',
-        'dementia medication': 'dementia_meds',
-        'dementia med': 'dementia_meds',
-        'dementia medicine': 'dementia_meds'
-    }
+    # Canonical IDs (e.g. 'birth_control') are already normalized
+    if drug_name in COMMON_DRUG_INFO:
+        return drug_name
     
     # Only return known drugs, no guessing
-    normalized = drug_mappings.get(drug_name, '')
+    normalized = DRUG_ALIASES.get(drug_name, '')
     if normalized and normalized in COMMON_DRUG_INFO:
         return normalized
     return ''
 
-def extract_drugs_from_query(query: str) -> List[str]:
-    """Extract drug names from a natural language query"""
+def extract_drugs_from_query(query: str, use_ner: bool = True) -> List[str]:
+    """Extract drug names from a natural language query.
+
+    Pass use_ner=False to skip the NER fallback, e.g. when the caller runs
+    extract_drugs_with_ner itself under admission control.
+    """
     if not query or not isinstance(query, str):
         return []
         
-    # Convert to lowercase for consistent matching
+    # Convert to lowercase for consistent matching; the NER model is cased, so keep the original
+    text = query
     query = query.lower()
     
-    # Strict list of known drugs and their variations
-    drug_variations = {
-        'sertraline': ['sertraline', 'zoloft'],
-        'melatonin': ['melatonin'],
-        'ibuprofen': ['ibuprofen', 'advil', 'motrin', 'brufen', 'nurofen'],
-        'metformin': ['metformin', 'glucophage'],
-        'insulin': ['insulin'],
-        'alcohol': ['alcohol', 'ethanol', 'drinking', 'beer', 'wine', 'liquor', 'drink', 'drinks', 'alcoholic', 'alcoholic beverage', 'alcoholic beverages'],
-        'aspirin': ['aspirin', 'bayer', 'bufferin', 'ecotrin'],
-        'acetaminophen': ['acetaminophen', 'tylenol', 'paracetamol', 'panadol'],
-        'amlodipine': ['amlodipine', 'norvasc'],
-        'simvastatin': ['simvastatin', 'zocor'],
-        'grapefruit': ['grapefruit', 'grapefruit juice'],
-        'atorvastatin': ['atorvastatin', 'lipitor'],
-        'amoxicillin': ['amoxicillin', 'amoxil'],
-        'warfarin': ['warfarin', 'coumadin'],
-        'cetirizine': ['cetirizine', 'zyrtec'],
-        'loratadine': ['loratadine', 'claritin'],
-        'naproxen': ['naproxen', 'aleve'],
-        'cbd': ['cbd', 'cbd oil', 'cannabidiol'],
-        'birth_control': ['birth control', 'oral contraceptive', 'contraceptive', 'birth control pills', 'the pill', 'birthcontrol'],
-        'antibiotics': ['antibiotics', 'antibiotic'],
-        'mao_inhibitors': ['mao inhibitor', 'mao inhibitors'],
-        'blood_thinners': ['blood thinner', 'blood thinners', 'anticoagulant', 'anticoagulants'],
-        'blood_pressure_meds': ['blood pressure medication', 'blood pressure med', 'blood pressure medicine'],
-        'metoprolol': ['metoprolol', 'lopressor', 'toprol'],
-        'dementia_meds': ['dementia medication', 'dementia med', 'dementia medicine']
-    }
-    
     # Extract only known drugs mentioned in the query
     found_drugs = set()
     
     # First check for exact matches
-    for drug, variations in drug_variations.items():
+    for drug, variations in DRUG_VARIATIONS.items():
         if any(variation in query for variation in variations):
             found_drugs.add(drug)
     
@@ -495,11 +662,35 @@ def extract_drugs_from_query(query: str) -> List[str]:
     # Filter out empty strings and ensure drugs exist in database
     valid_drugs = [drug for drug in found_drugs if drug and drug in COMMON_DRUG_INFO]
     
+    # Fall back to the NER model only when the keyword matcher finds nothing
+    if not valid_drugs and use_ner and drug_ner.enabled:
+        valid_drugs = extract_drugs_with_ner(text)
+    
     # Log the extracted drugs for debugging
     logger.info(f"Extracted drugs from query: {valid_drugs}")
     
     return valid_drugs
 
+def resolve_drug_mention(mention: str) -> str:
+    """Map a free-text drug mention to a known drug, allowing for misspellings"""
+    normalized = normalize_drug_name(mention)
+    if normalized:
+        return normalized
+    close = difflib.get_close_matches(mention.lower().strip(), DRUG_ALIASES.keys(), n=1, cutoff=0.85)
+    return normalize_drug_name(close[0]) if close else ''
+
+def extract_drugs_with_ner(query: str) -> List[str]:
+    """Extract known drugs from a query using the NER model"""
+    try:
+        mentions = drug_ner.extract_mentions(query)
+    except Exception as e:
+        logger.error(f"NER extraction failed: {str(e)}")
+        return []
+    found_drugs = {resolve_drug_mention(mention) for mention in mentions}
+    found_drugs.discard('')
+    logger.info(f"NER mentions {mentions} resolved to {sorted(found_drugs)}")
+    return list(found_drugs)
+
 def get_fda_data(drug_name: str) -> Dict[str, str]:
     """Get FDA data for a drug"""
     try:
@@ -526,12 +717,25 @@ def get_fda_data(drug_name: str) -> Dict[str, str]:
         logger.error(f"Error getting FDA data: {str(e)}")
         raise ValueError(f"Error retrieving information for {drug_name}")
 
+def classify_ai_analysis(analysis: str) -> Severity:
+    """Severity of an AI analysis, derived once when the analysis is received"""
+    lowered = analysis.lower()
+    if "dangerous" in lowered or "severe" in lowered:
+        return Severity.WARNING
+    return Severity.CAUTION
+
 def analyze_with_ai(drugs: List[str], query_type: str = "interaction") -> Tuple[bool, str]:
     """Analyze drug interactions or side effects using OpenAI API"""
     try:
-        if not openai.api_key:
+        client = get_openai_client()
+        if client is None:
             return True, "Note: Advanced AI analysis is not available. Please consult your healthcare provider for detailed information."
 
+        cache_key = f"ai:{KNOWLEDGE_BASE_VERSION}:{query_type}:{','.join(sorted(drugs))}"
+        cached = get_enrichment_cache().get(cache_key)
+        if cached is not None:
+            return cached[0], cached[1]
+
         if query_type == "side_effects" and len(drugs) == 1:
             prompt = f"""Analyze the potential side effects of {drugs[0]}.
             Consider:
@@ -552,7 +756,7 @@ def analyze_with_ai(drugs: List[str], query_type: str = "interaction") -> Tuple[
             
             Provide a clear, concise response focusing on safety."""
 
-        response = openai.ChatCompletion.create(
+        response = client.chat.completions.create(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "You are a medical information assistant. Provide clear, factual information about drug interactions and side effects. Always emphasize consulting healthcare providers for personalized advice."},
@@ -563,7 +767,8 @@ def analyze_with_ai(drugs: List[str], query_type: str = "interaction") -> Tuple[
         )
 
         analysis = response.choices[0].message.content
-        is_safe = "dangerous" not in analysis.lower() and "severe" not in analysis.lower()
+        is_safe = classify_ai_analysis(analysis) < Severity.WARNING
+        get_enrichment_cache().put(cache_key, [is_safe, analysis], ttl=AI_CACHE_TTL)
         return is_safe, analysis
 
     except Exception as e:
@@ -604,24 +809,13 @@ def check_drug_interaction(drugs: List[str], query_type: str = "interaction") ->
             cautions = []
             
             # Check each pair of drugs
-            for i, drug1 in enumerate(drugs):
-                for j, drug2 in enumerate(drugs[i+1:], i+1):
-                    if drug1 in COMMON_DRUG_INFO and drug2 in COMMON_DRUG_INFO:
-                        interactions1 = COMMON_DRUG_INFO[drug1].get('interactions', {})
-                        interactions2 = COMMON_DRUG_INFO[drug2].get('interactions', {})
-                        
-                        if drug2 in interactions1:
-                            message = f"{drug1} and {drug2}: {interactions1[drug2]}"
-                            if 'WARNING' in interactions1[drug2]:
-                                warnings.append(message)
-                                is_safe = False
-                            else:
-                                cautions.append(message)
-                        elif drug1 in interactions2:
-                            message = f"{drug1} and {drug2}: {interactions2[drug1]}"
-                            if 'WARNING' in interactions2[drug1]:
-                                warnings.append(message)
-                                is_safe = False
+            for interaction in get_interactions(drugs, Severity.CAUTION):
+                message = f"{interaction.drug} and {interaction.other}: {interaction.message}"
+                if interaction.severity >= Severity.WARNING:
+                    warnings.append(message)
+                    is_safe = False
+                else:
+                    cautions.append(message)
             
             # Build response message
             response_parts = []
@@ -646,55 +840,40 @@ def check_drug_interaction(drugs: List[str], query_type: str = "interaction") ->
         logger.error(f"Error checking drug interactions: {str(e)}")
         return True, "Unable to perform detailed analysis. Please consult your healthcare provider."
 
+def interaction_result(drug1: str, drug2: str, interaction: Interaction, recommendation: str) -> Dict[str, Any]:
+    """Build the get_drug_interaction result for a known interaction"""
+    return {
+        'drug1': drug1,
+        'drug2': drug2,
+        'interaction': interaction.message,
+        'severity': SEVERITY_LABELS[interaction.severity],
+        'is_safe': interaction.severity < Severity.WARNING,
+        'mechanism': interaction.mechanism,
+        'recommendation': interaction.recommendation or recommendation
+    }
+
 def get_drug_interaction(drug1: str, drug2: str) -> Dict[str, Any]:
     """Get interaction information between two drugs"""
     try:
         normalized_drug1 = normalize_drug_name(drug1)
         normalized_drug2 = normalize_drug_name(drug2)
         
-        # Handle alcohol/ethanol as a special case
-        alcohol_terms = ['alcohol', 'ethanol', 'drinking', 'beer', 'wine', 'liquor', 'drink', 'drinks', 'alcoholic', 'alcoholic beverage', 'alcoholic beverages']
-        is_alcohol = normalized_drug1 in alcohol_terms or normalized_drug2 in alcohol_terms
+        # Handle alcohol/ethanol as a special case (it has no knowledge base entry
+        # of its own, so match the raw names rather than the normalized ones)
+        is_alcohol1 = drug1.lower().strip() in ALCOHOL_TERMS
+        is_alcohol = is_alcohol1 or drug2.lower().strip() in ALCOHOL_TERMS
         
         # If one of the drugs is alcohol, check interaction with the other drug
         if is_alcohol:
-            other_drug = normalized_drug2 if normalized_drug1 in alcohol_terms else normalized_drug1
-            if other_drug in COMMON_DRUG_INFO:
-                alcohol_interaction = COMMON_DRUG_INFO[other_drug].get('interactions', {}).get('alcohol')
-                if alcohol_interaction:
-                    return {
-                        'drug1': drug1,
-                        'drug2': drug2,
-                        'interaction': alcohol_interaction,
-                        'severity': 'high' if 'WARNING' in alcohol_interaction else 'moderate',
-                        'is_safe': False if 'WARNING' in alcohol_interaction else True,
-                        'recommendation': 'Please consult your healthcare provider before consuming alcohol while taking this medication.'
-                    }
+            other_drug = normalized_drug2 if is_alcohol1 else normalized_drug1
+            alcohol_interaction = INTERACTION_INDEX.get((other_drug, 'alcohol'))
+            if alcohol_interaction:
+                return interaction_result(drug1, drug2, alcohol_interaction, 'Please consult your healthcare provider before consuming alcohol while taking this medication.')
         
-        # Check if both drugs are in our database
-        if normalized_drug1 in COMMON_DRUG_INFO and normalized_drug2 in COMMON_DRUG_INFO:
-            interactions1 = COMMON_DRUG_INFO[normalized_drug1].get('interactions', {})
-            interactions2 = COMMON_DRUG_INFO[normalized_drug2].get('interactions', {})
-            
-            # Check for direct interaction
-            if normalized_drug2 in interactions1:
-                return {
-                    'drug1': drug1,
-                    'drug2': drug2,
-                    'interaction': interactions1[normalized_drug2],
-                    'severity': 'high' if 'WARNING' in interactions1[normalized_drug2] else 'moderate',
-                    'is_safe': False if 'WARNING' in interactions1[normalized_drug2] else True,
-                    'recommendation': 'Please consult your healthcare provider before taking these medications together.'
-                }
-            elif normalized_drug1 in interactions2:
-                return {
-                    'drug1': drug1,
-                    'drug2': drug2,
-                    'interaction': interactions2[normalized_drug1],
-                    'severity': 'high' if 'WARNING' in interactions2[normalized_drug1] else 'moderate',
-                    'is_safe': False if 'WARNING' in interactions2[normalized_drug1] else True,
-                    'recommendation': 'Please consult your healthcare provider before taking these medications together.'
-                }
+        # Check for direct interaction
+        interaction = find_interaction(normalized_drug1, normalized_drug2)
+        if interaction:
+            return interaction_result(drug1, drug2, interaction, 'Please consult your healthcare provider before taking these medications together.')
         
         # If no direct interaction found, check for common interactions
         common_interactions = []
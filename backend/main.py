@@ -1,11 +1,38 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, PlainTextResponse, RedirectResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from fda_api import get_fda_data, check_drug_interaction, extract_drugs_from_query, normalize_drug_name
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field
+from ner import drug_ner
+from fda_api import (
+    get_fda_data, check_drug_interaction, extract_drugs_from_query, extract_drugs_with_ner, normalize_drug_name,
+    get_interactions,
+    build_interaction_matrix,
+    KNOWLEDGE_BASE_VERSION, SEVERITY_BY_LABEL, SEVERITY_LABELS, Severity
+)
+from admission import AdmissionController, Overloaded, PRIORITY_CACHED, PRIORITY_ENRICH
+from cache import LRUCache
+from suggest import DrugSuggester
+from profiling import ProfileCapture, RequestProfiler, format_stats
+from rate_limit import InMemoryBackend, RateLimit, RateLimitMiddleware, RedisBackend, parse_limits
+from serialization import FastJSONResponse, dumps_json, project_drug_response
+import asyncio
+import hashlib
+import hmac
+import json
 import logging
-from typing import List
+import time
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Any, Dict, List, Literal, Optional, Tuple
 import os
 
+try:
+    from brotli_asgi import BrotliMiddleware
+except ImportError:  # optional dependency, gzip is used on its own
+    BrotliMiddleware = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -14,12 +41,74 @@ logger = logging.getLogger(__name__)
 ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
 FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:5173")
 
+# Admission control / backpressure settings
+MAX_CONCURRENT_REQUESTS = int(os.getenv("MAX_CONCURRENT_REQUESTS", 8))
+MAX_QUEUED_REQUESTS = int(os.getenv("MAX_QUEUED_REQUESTS", 32))
+QUEUE_TIMEOUT_SECONDS = float(os.getenv("QUEUE_TIMEOUT_SECONDS", 2.0))
+RETRY_AFTER_SECONDS = int(os.getenv("RETRY_AFTER_SECONDS", 1))
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", 1024))
+
+# HTTP caching for the GET variant of the interaction check
+HTTP_CACHE_MAX_AGE = int(os.getenv("HTTP_CACHE_MAX_AGE", 3600))
+
+# Opt-in fast path: skip response_model re-validation of trusted data and use orjson
+FAST_RESPONSES = os.getenv("FAST_RESPONSES", "false").lower() in ("1", "true", "yes")
+COMPRESSION_MINIMUM_SIZE = int(os.getenv("COMPRESSION_MINIMUM_SIZE", 1024))
+
+MAX_MATRIX_DRUGS = int(os.getenv("MAX_MATRIX_DRUGS", 500))
+
+# Admin endpoints are disabled unless ADMIN_TOKEN is set
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", 100))
+
+# Per-API-key token buckets; RATE_LIMIT_REDIS_URL shares them across workers and nodes.
+# Opt-in: requests without a known key are limited per client IP, so behind a reverse
+# proxy run uvicorn with --proxy-headers --forwarded-allow-ips=<proxy addresses> or
+# every user shares the proxy's bucket.
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "false").lower() in ("1", "true", "yes")
+RATE_LIMIT_RATE = float(os.getenv("RATE_LIMIT_RATE", 5))
+RATE_LIMIT_BURST = int(os.getenv("RATE_LIMIT_BURST", 20))
+RATE_LIMIT_OVERRIDES = os.getenv("RATE_LIMIT_OVERRIDES", "")  # e.g. "partner-key=50/100"
+# Keys that get their own bucket at the default limit; override keys are included automatically
+RATE_LIMIT_API_KEYS = [k.strip() for k in os.getenv("RATE_LIMIT_API_KEYS", "").split(",") if k.strip()]
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL")
+
+# Representative queries replayed at startup to populate caches, separated by ";"
+WARMUP_QUERIES = [q.strip() for q in os.getenv(
+    "WARMUP_QUERIES",
+    "Can I take advil with zoloft?;Is it safe to take tylenol and aspirin?;"
+    "metformin and insulin;warfarin and ibuprofen;lipitor with grapefruit;melatonin"
+).split(";") if q.strip()]
+
+# Set once the startup warm-up has finished; reported by /ready
+readiness: Dict[str, Any] = {"ready": False, "warmup_seconds": None}
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm up in the background so the liveness probe answers straight away
+    warmup_task = asyncio.create_task(run_in_threadpool(warm_up))
+    yield
+    warmup_task.cancel()
+
 app = FastAPI(
     title="Drug Interaction API",
     description="API for checking drug information and interactions using FDA data",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+# Rate limiting sits inside CORS so 429 responses still carry CORS headers
+if RATE_LIMIT_ENABLED:
+    app.add_middleware(
+        RateLimitMiddleware,
+        backend=RedisBackend(RATE_LIMIT_REDIS_URL) if RATE_LIMIT_REDIS_URL else InMemoryBackend(),
+        default_limit=RateLimit(RATE_LIMIT_RATE, RATE_LIMIT_BURST),
+        limits=parse_limits(RATE_LIMIT_OVERRIDES),
+        api_keys=RATE_LIMIT_API_KEYS,
+        paths=["/check-interactions", "/interactions"],
+    )
+
 # CORS configuration
 app.add_middleware(
     CORSMiddleware,
@@ -31,11 +120,48 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Retry-After", "ETag", "X-Profile-Id", "Server-Timing"],
+)
+
+# Compress large label payloads (brotli when available, gzip otherwise)
+if BrotliMiddleware is not None:
+    app.add_middleware(BrotliMiddleware, minimum_size=COMPRESSION_MINIMUM_SIZE, gzip_fallback=True)
+else:
+    app.add_middleware(GZipMiddleware, minimum_size=COMPRESSION_MINIMUM_SIZE)
+
+admission = AdmissionController(
+    max_concurrent=MAX_CONCURRENT_REQUESTS,
+    max_queue=MAX_QUEUED_REQUESTS,
+    queue_timeout=QUEUE_TIMEOUT_SECONDS,
+    retry_after=RETRY_AFTER_SECONDS,
 )
 
+# Responses keyed on the canonical (sorted, normalized) drug set
+response_cache = LRUCache(maxsize=RESPONSE_CACHE_SIZE)
+# Prefix index over every known drug alias for autocomplete
+suggester = DrugSuggester.from_knowledge_base()
+
+# On-demand per-request profiling, switched on through /admin/profiling for every worker sharing PROFILE_DIR
+profiler = RequestProfiler(PROFILE_DIR, max_files=PROFILE_MAX_FILES)
+
+# Pre-encoded JSON bodies for the fast response path, same keys as response_cache
+encoded_response_cache = LRUCache(maxsize=RESPONSE_CACHE_SIZE)
+
+SeverityLabel = Literal["none", "moderate", "high"]
+
 class DrugQuery(BaseModel):
     query: str
     query_type: str = "interaction"  # Can be "interaction" or "side_effects"
+    min_severity: SeverityLabel = "none"  # Only list interactions at least this severe
+
+class MatrixQuery(BaseModel):
+    drugs: List[str] = Field(..., min_length=1, max_length=MAX_MATRIX_DRUGS)
+
+class ProfilingConfig(BaseModel):
+    enabled: bool
+    sample_rate: float = Field(0.0, ge=0.0, le=1.0)
+    match_header: Optional[str] = None  # Profile every request carrying this header
+    inline: bool = False  # Return stats as text instead of the normal response (match_header requests only)
 
 class DrugInfo(BaseModel):
     name: str
@@ -44,11 +170,26 @@ class DrugInfo(BaseModel):
     warnings: str
     is_safe: bool
 
+class InteractionInfo(BaseModel):
+    drugs: List[str]
+    severity: SeverityLabel
+    severity_code: int
+    mechanism: str
+    recommendation: str
+    message: str
+
 class DrugResponse(BaseModel):
     drugs: List[DrugInfo]
     safe: bool
     interaction_message: str
     friendly_response: str
+    interactions: List[InteractionInfo] = []  # Most severe first
+
+# Part of every ETag. Schema changes are picked up automatically; bump
+# app.version when response wording changes so cached bodies are revalidated.
+RESPONSE_VERSION = hashlib.sha256(
+    (app.version + json.dumps(DrugResponse.model_json_schema(), sort_keys=True)).encode("utf-8")
+).hexdigest()[:8]
 
 def generate_friendly_response(drugs: List[DrugInfo], is_safe: bool, interaction_message: str, query: str) -> str:
     """Generate a friendly, conversational response about the drug interaction or side effects."""
@@ -74,6 +215,192 @@ def normalize_drug_names(drugs: List[str]) -> List[str]:
             normalized.add(normalized_name)
     return list(normalized)
 
+def canonical_drug_key(drugs: List[str]) -> Tuple[str, ...]:
+    """Canonical cache key for a set of drugs: normalized, deduplicated and sorted"""
+    return tuple(sorted(normalize_drug_names(drugs)))
+
+def build_drug_response(drugs: Tuple[str, ...]) -> Dict[str, Any]:
+    """Run the lookup pipeline for a canonical drug set and cache the result"""
+    cached = response_cache.get(drugs)
+    if cached is not None:
+        return cached
+
+    results = []
+
+    # Get drug info from FDA API
+    for drug in drugs:
+        logger.info(f"Fetching data for drug: {drug}")
+        drug_info = get_fda_data(drug)
+        if drug_info:
+            results.append(drug_info)
+
+    # Check for interactions between drugs
+    is_safe, interaction_message = check_drug_interaction(list(drugs))
+
+    # Generate friendly response
+    friendly_response = generate_friendly_response(results, is_safe, interaction_message, ", ".join(drugs))
+
+    # Structured interactions, pre-sorted by severity
+    interactions = [
+        {
+            "drugs": [interaction.drug, interaction.other],
+            "severity": SEVERITY_LABELS[interaction.severity],
+            "severity_code": int(interaction.severity),
+            "mechanism": interaction.mechanism,
+            "recommendation": interaction.recommendation,
+            "message": interaction.message
+        }
+        for interaction in get_interactions(list(drugs))
+    ]
+
+    response = {
+        "drugs": results,
+        "safe": is_safe,
+        "interaction_message": interaction_message,
+        "friendly_response": friendly_response,
+        "interactions": interactions
+    }
+    response_cache.put(drugs, response)
+    return response
+
+def warm_up() -> None:
+    """Load lazy resources and replay WARMUP_QUERIES, then mark the worker ready"""
+    start = time.monotonic()
+    try:
+        if drug_ner.enabled:
+            drug_ner.get_pipeline()
+        for query in WARMUP_QUERIES:
+            drugs = canonical_drug_key(extract_drugs_from_query(query))
+            if drugs:
+                render_drug_response(drugs, build_drug_response(drugs))
+                suggester.suggest(drugs[0][:3])
+    except Exception as e:
+        # Warm-up only primes caches; a failure must not keep the worker out of rotation
+        logger.error(f"Warm-up failed: {str(e)}")
+    readiness["warmup_seconds"] = round(time.monotonic() - start, 3)
+    readiness["ready"] = True
+    logger.info(f"Warm-up finished in {readiness['warmup_seconds']}s ({len(WARMUP_QUERIES)} queries, {len(response_cache)} cached responses)")
+
+def response_etag(drugs: Tuple[str, ...], min_severity: Severity = Severity.NONE) -> str:
+    """ETag for a canonical drug set under the current knowledge base and response version.
+
+    Weak, because the compression middleware serves the same representation
+    gzip- or brotli-encoded under one ETag.
+    """
+    digest = hashlib.sha256(f"{','.join(drugs)};{int(min_severity)}".encode("utf-8")).hexdigest()[:16]
+    return f'W/"{KNOWLEDGE_BASE_VERSION}-{RESPONSE_VERSION}-{digest}"'
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header value against an ETag"""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+@asynccontextmanager
+async def admitted(priority: int, capture: Optional[ProfileCapture] = None, timing: str = "admission"):
+    """Hold an admission slot, turning Overloaded into a 503 with Retry-After"""
+    queued_at = time.perf_counter()
+    try:
+        await admission.acquire(priority)
+    except Overloaded as e:
+        logger.warning(f"Rejecting request ({e.reason}): active={admission.active} queued={admission.queued}")
+        raise HTTPException(
+            status_code=503,
+            detail="Service is busy, please retry shortly",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    if capture is not None:
+        capture.timings[timing] = time.perf_counter() - queued_at
+    try:
+        yield
+    finally:
+        admission.release()
+
+async def extract_drugs_admitted(query: str, capture: Optional[ProfileCapture] = None) -> List[str]:
+    """Keyword extraction, falling back to NER under admission control.
+
+    The model forward pass is the most expensive step in the service, so it
+    queues with the enrichment pipelines instead of bypassing the cap.
+    """
+    extract, ner = extract_drugs_from_query, extract_drugs_with_ner
+    if capture is not None:
+        extract, ner = partial(capture.call, extract), partial(capture.call, ner)
+    drugs = extract(query, use_ner=False)
+    if drugs or not drug_ner.enabled:
+        return drugs
+    async with admitted(PRIORITY_ENRICH, capture, timing="ner_admission"):
+        # The NER fallback blocks on a micro-batch, so keep it off the event loop
+        return await run_in_threadpool(ner, query)
+
+async def admit_and_build(drugs: Tuple[str, ...], capture: Optional[ProfileCapture] = None) -> Dict[str, Any]:
+    """Build the response for a canonical drug set under admission control"""
+    # Cached answers jump ahead of requests that still need the full pipeline
+    priority = PRIORITY_CACHED if drugs in response_cache else PRIORITY_ENRICH
+    try:
+        async with admitted(priority, capture):
+            if capture is not None:
+                return await run_in_threadpool(capture.call, build_drug_response, drugs)
+            if priority == PRIORITY_CACHED:
+                return build_drug_response(drugs)
+            return await run_in_threadpool(build_drug_response, drugs)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error processing request: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+def filter_interactions(result: Dict[str, Any], min_severity: Severity) -> Dict[str, Any]:
+    """Drop interactions below min_severity (the list is already sorted, so this is a prefix)"""
+    if min_severity == Severity.NONE:
+        return result
+    interactions = result["interactions"]
+    keep = next((i for i, item in enumerate(interactions) if item["severity_code"] < min_severity), len(interactions))
+    return {**result, "interactions": interactions[:keep]}
+
+def render_drug_response(drugs: Tuple[str, ...], result: Dict[str, Any], headers: Optional[Dict[str, str]] = None,
+                         min_severity: Severity = Severity.NONE):
+    """Return the result as-is for response_model validation, or pre-encoded on the fast path"""
+    if not FAST_RESPONSES:
+        return filter_interactions(result, min_severity)
+    key = (drugs, min_severity)
+    body = encoded_response_cache.get(key)
+    if body is None:
+        body = dumps_json(project_drug_response(filter_interactions(result, min_severity)))
+        encoded_response_cache.put(key, body)
+    return FastJSONResponse(content=body, headers=headers)
+
+def render_validated_response(drugs: Tuple[str, ...], result: Dict[str, Any], headers: Optional[Dict[str, str]] = None,
+                              min_severity: Severity = Severity.NONE) -> Response:
+    """render_drug_response plus the response_model validation and encoding FastAPI would do after the handler"""
+    rendered = render_drug_response(drugs, result, headers=headers, min_severity=min_severity)
+    if isinstance(rendered, Response):
+        return rendered
+    return JSONResponse(content=DrugResponse.model_validate(rendered).model_dump(mode="json"), headers=headers)
+
+def profiled_response(capture: ProfileCapture, label: str, drugs: Tuple[str, ...], result: Dict[str, Any],
+                      headers: Optional[Dict[str, str]] = None, min_severity: Severity = Severity.NONE) -> Response:
+    """Render under the profiler, save the profile and attach its id.
+
+    Header-matched requests may get the stats inline instead of the body.
+    """
+    rendered = capture.call(render_validated_response, drugs, result, headers=headers, min_severity=min_severity)
+    profile_id = profiler.save(capture, label)
+    if profile_id is None:
+        return rendered
+    profile_headers = {"X-Profile-Id": profile_id, "Server-Timing": capture.server_timing()}
+    if capture.inline:
+        try:
+            return PlainTextResponse(format_stats(capture.profile), headers=profile_headers)
+        except Exception as e:
+            logger.error(f"Could not format profile {profile_id}: {str(e)}")
+    rendered.headers.update(profile_headers)
+    return rendered
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    if not ADMIN_TOKEN or not x_admin_token or not hmac.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Forbidden")
+
 @app.get("/")
 async def root():
     return {
@@ -81,49 +408,138 @@ async def root():
         "docs_url": "/docs",
         "redoc_url": "/redoc",
         "endpoints": {
-            "check_interactions": "/check-interactions (POST)"
+            "check_interactions": "/check-interactions (POST)",
+            "check_interactions_cacheable": "/check-interactions?drugs=<id>,<id> (GET)",
+            "suggest_drugs": "/drugs/suggest?prefix=<text> (GET)",
+            "interaction_matrix": "/interactions/matrix (POST)"
         }
     }
 
+@app.get("/health")
+async def health():
+    """Liveness: the process is up and serving"""
+    return {"status": "ok"}
+
+@app.get("/ready")
+async def ready():
+    """Readiness: warm-up has finished and the worker can take traffic"""
+    if not readiness["ready"]:
+        raise HTTPException(status_code=503, detail="Warming up")
+    return {"status": "ready", "warmup_seconds": readiness["warmup_seconds"]}
+
 @app.post("/check-interactions", response_model=DrugResponse)
-async def check_drug_interactions_endpoint(query: DrugQuery):
+async def check_drug_interactions_endpoint(query: DrugQuery, request: Request):
+    logger.info(f"Received query: {query.query}")
+    capture = profiler.start(request.headers)
     try:
-        logger.info(f"Received query: {query.query}")
-        
         # Extract drugs from the natural language query
-        drugs = extract_drugs_from_query(query.query)
+        drugs = await extract_drugs_admitted(query.query, capture)
         if not drugs:
             raise HTTPException(status_code=400, detail="No drugs found in the query")
-        
+
         # Normalize drug names to prevent duplicates
-        drugs = normalize_drug_names(drugs)
-        logger.info(f"Extracted drugs: {drugs}")
-        
-        results = []
-        
-        # Get drug info from FDA API
-        for drug in drugs:
-            logger.info(f"Fetching data for drug: {drug}")
-            drug_info = get_fda_data(drug)
-            if drug_info:
-                results.append(drug_info)
-        
-        # Check for interactions between drugs
-        is_safe, interaction_message = check_drug_interaction(drugs)
-        
-        # Generate friendly response
-        friendly_response = generate_friendly_response(results, is_safe, interaction_message, query.query)
-        
-        logger.info(f"Returning results for {len(results)} drugs")
-        return {
-            "drugs": results,
-            "safe": is_safe,
-            "interaction_message": interaction_message,
-            "friendly_response": friendly_response
-        }
-    except Exception as e:
-        logger.error(f"Error processing request: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+        drugs = canonical_drug_key(drugs)
+        logger.info(f"Extracted drugs: {list(drugs)}")
+        suggester.record(drugs)
+
+        result = await admit_and_build(drugs, capture)
+        logger.info(f"Returning results for {len(result['drugs'])} drugs")
+        min_severity = SEVERITY_BY_LABEL[query.min_severity]
+        if capture is not None:
+            return profiled_response(capture, f"POST /check-interactions {','.join(drugs)}", drugs, result,
+                                     min_severity=min_severity)
+        return render_drug_response(drugs, result, min_severity=min_severity)
+    finally:
+        profiler.finish(capture)
+
+@app.get("/check-interactions", response_model=DrugResponse)
+async def check_drug_interactions_get_endpoint(
+    request: Request,
+    response: Response,
+    drugs: str = Query(..., description="Comma-separated drug names or IDs"),
+    min_severity: SeverityLabel = Query("none", description="Only list interactions at least this severe")
+):
+    """Cacheable interaction check keyed on the canonical drug set.
+
+    Non-canonical requests (brand names, different order, duplicates) are
+    redirected to the canonical URL so HTTP caches converge on one entry.
+    """
+    requested = [d.strip().lower() for d in drugs.split(",") if d.strip()]
+    unknown = [d for d in requested if not normalize_drug_name(d)]
+    if not requested or unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown drugs: {', '.join(unknown)}" if unknown else "No drugs given")
+
+    canonical = canonical_drug_key(requested)
+    if list(canonical) != requested:
+        url = request.url.include_query_params(drugs=",".join(canonical))
+        return RedirectResponse(str(url), status_code=308)
+
+    suggester.record(canonical)
+    severity_floor = SEVERITY_BY_LABEL[min_severity]
+    etag = response_etag(canonical, severity_floor)
+    cache_headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={HTTP_CACHE_MAX_AGE}",
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=cache_headers)
+
+    capture = profiler.start(request.headers)
+    try:
+        result = await admit_and_build(canonical, capture)
+        if capture is not None:
+            return profiled_response(capture, f"GET /check-interactions {','.join(canonical)}", canonical, result,
+                                     headers=cache_headers, min_severity=severity_floor)
+        if FAST_RESPONSES:
+            return render_drug_response(canonical, result, headers=cache_headers, min_severity=severity_floor)
+        response.headers.update(cache_headers)
+        return render_drug_response(canonical, result, min_severity=severity_floor)
+    finally:
+        profiler.finish(capture)
+
+@app.post("/interactions/matrix")
+async def interaction_matrix_endpoint(query: MatrixQuery):
+    """Full N x N severity matrix for a list of drugs, computed in one pass"""
+    drugs = []
+    unknown = []
+    for name in query.drugs:
+        drug = normalize_drug_name(name)
+        if not drug:
+            unknown.append(name)
+        elif drug not in drugs:
+            drugs.append(drug)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown drugs: {', '.join(unknown)}")
+
+    # Trusted internal data: encode directly rather than through jsonable_encoder
+    return FastJSONResponse(content=build_interaction_matrix(drugs))
+
+@app.get("/drugs/suggest")
+async def suggest_drugs_endpoint(
+    response: Response,
+    prefix: str = Query(..., max_length=100),
+    limit: int = Query(10, ge=1, le=50)
+):
+    """Autocomplete drug names, tolerating a single typo"""
+    response.headers["Cache-Control"] = f"public, max-age={HTTP_CACHE_MAX_AGE}"
+    return {"prefix": prefix, "suggestions": suggester.suggest(prefix, limit)}
+
+@app.get("/admin/profiling", dependencies=[Depends(require_admin)])
+async def get_profiling_endpoint():
+    return profiler.settings()
+
+@app.put("/admin/profiling", dependencies=[Depends(require_admin)])
+async def configure_profiling_endpoint(config: ProfilingConfig):
+    profiler.configure(config.enabled, config.sample_rate, config.match_header, config.inline)
+    return profiler.settings()
+
+@app.get("/admin/profiles/{profile_id}", dependencies=[Depends(require_admin)], response_class=PlainTextResponse)
+async def get_profile_endpoint(profile_id: str, limit: int = Query(40, ge=1, le=500)):
+    text = profiler.describe(profile_id, limit)
+    if text is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return text
 
 if __name__ == "__main__":
     import uvicorn
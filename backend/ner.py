@@ -0,0 +1,140 @@
+from concurrent.futures import Future
+from typing import Callable, List, Optional, Tuple
+import logging
+import os
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Hugging Face token-classification model for drug mentions; unset disables NER
+DRUG_NER_MODEL = os.getenv("DRUG_NER_MODEL")
+# "torch", "quantized" (dynamic int8 on Linear layers) or "onnx" (requires optimum[onnxruntime])
+DRUG_NER_RUNTIME = os.getenv("DRUG_NER_RUNTIME", "torch")
+# Entity groups the model uses for drugs/chemicals
+DRUG_NER_LABELS = {label.strip().upper() for label in os.getenv("DRUG_NER_LABELS", "DRUG,CHEMICAL,CHEM").split(",")}
+DRUG_NER_BATCH_WINDOW_MS = float(os.getenv("DRUG_NER_BATCH_WINDOW_MS", 5))
+DRUG_NER_MAX_BATCH = int(os.getenv("DRUG_NER_MAX_BATCH", 32))
+DRUG_NER_TIMEOUT = float(os.getenv("DRUG_NER_TIMEOUT", 5))
+
+
+class MicroBatcher:
+    """Collects items submitted from concurrent threads into batches.
+
+    The first item opens a window of `window` seconds; everything submitted
+    before it closes (up to `max_batch` items) is handed to `fn` in one call.
+    Callers block until their own result is ready.
+    """
+
+    def __init__(self, fn: Callable[[List[str]], List], max_batch: int, window: float):
+        self.fn = fn
+        self.max_batch = max_batch
+        self.window = window
+        self._queue: "queue.Queue[Tuple[str, Future]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, item: str, timeout: Optional[float] = None):
+        if self._worker is None:
+            with self._lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._run, name="ner-batcher", daemon=True)
+                    self._worker.start()
+        future: Future = Future()
+        self._queue.put((item, future))
+        return future.result(timeout)
+
+    def _collect(self) -> List[Tuple[str, Future]]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            try:
+                results = list(self.fn([item for item, _ in batch]))
+                if len(results) != len(batch):
+                    # Results can no longer be matched to callers, so fail the whole batch
+                    raise RuntimeError(f"Batch function returned {len(results)} results for {len(batch)} items")
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+
+class DrugNER:
+    """CPU-only drug mention tagger, loaded once per worker on first use"""
+
+    def __init__(self, model_name: Optional[str], runtime: str = "torch"):
+        self.model_name = model_name
+        self.runtime = runtime
+        self._pipeline = None
+        self._lock = threading.Lock()
+        self._batcher = MicroBatcher(self._predict_batch, DRUG_NER_MAX_BATCH, DRUG_NER_BATCH_WINDOW_MS / 1000)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.model_name)
+
+    def _load(self):
+        from transformers import AutoTokenizer, pipeline
+
+        start = time.monotonic()
+        tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+        if self.runtime == "onnx":
+            from optimum.onnxruntime import ORTModelForTokenClassification
+            model = ORTModelForTokenClassification.from_pretrained(self.model_name, export=True)
+        else:
+            import torch
+            from transformers import AutoModelForTokenClassification
+            model = AutoModelForTokenClassification.from_pretrained(self.model_name)
+            model.eval()
+            if self.runtime == "quantized":
+                model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+        ner_pipeline = pipeline(
+            "token-classification",
+            model=model,
+            tokenizer=tokenizer,
+            aggregation_strategy="simple",
+            device=-1,
+        )
+        logger.info(f"Loaded NER model {self.model_name} ({self.runtime}) in {time.monotonic() - start:.2f}s")
+        return ner_pipeline
+
+    def get_pipeline(self):
+        if self._pipeline is None:
+            with self._lock:
+                if self._pipeline is None:
+                    self._pipeline = self._load()
+        return self._pipeline
+
+    def _predict_batch(self, texts: List[str]) -> List[List[str]]:
+        """One forward pass over a batch of queries, returning drug mentions per query"""
+        outputs = self.get_pipeline()(texts, batch_size=len(texts))
+        if len(texts) == 1 and (not outputs or isinstance(outputs[0], dict)):
+            # A single input may come back as a flat list of entities
+            outputs = [outputs]
+        return [
+            [entity["word"].strip().lower() for entity in entities if entity["entity_group"].upper() in DRUG_NER_LABELS]
+            for entities in outputs
+        ]
+
+    def extract_mentions(self, text: str) -> List[str]:
+        """Drug mentions in `text`, batched with concurrent callers"""
+        return self._batcher.submit(text, timeout=DRUG_NER_TIMEOUT)
+
+
+drug_ner = DrugNER(DRUG_NER_MODEL, DRUG_NER_RUNTIME)
@@ -0,0 +1,200 @@
+import cProfile
+import glob
+import io
+import json
+import logging
+import os
+import pstats
+import random
+import re
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+PROFILE_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+SETTINGS_FILE = "settings.json"
+
+
+class ProfileCapture:
+    """One request's profile. Profiling errors never propagate to the request."""
+
+    def __init__(self, inline: bool):
+        self.profile = cProfile.Profile()
+        # Only requests that explicitly asked (via the match header) may get stats instead of their body
+        self.inline = inline
+        self.failed = False
+        # Wall-clock phases cProfile cannot see (e.g. waiting for admission), in seconds
+        self.timings: Dict[str, float] = {}
+
+    def call(self, fn: Callable, *args, **kwargs):
+        try:
+            self.profile.enable()
+        except ValueError as e:
+            # Python >= 3.12 refuses a second active profiler in the process
+            logger.warning(f"Profiling skipped: {str(e)}")
+            self.failed = True
+            return fn(*args, **kwargs)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.profile.disable()
+
+    def server_timing(self) -> str:
+        """The recorded timings as a Server-Timing header value"""
+        return ", ".join(f"{name};dur={seconds * 1000:.2f}" for name, seconds in self.timings.items())
+
+
+class RequestProfiler:
+    """On-demand cProfile capture for a sample of requests.
+
+    Disabled by default. When enabled, a request is profiled if it carries
+    `match_header` or wins the `sample_rate` draw, and no other request in
+    this process is being profiled at the time. Captured stats are written to
+    `output_dir` as .prof files (loadable with pstats, snakeviz or
+    flameprof), keeping at most `max_files`. Requests carrying the match
+    header can also get the stats inline.
+
+    Settings are persisted to `output_dir`/settings.json and every worker
+    sharing that directory picks them up within `refresh_interval` seconds,
+    so one admin call configures all workers. They also survive restarts
+    until profiling is switched off again.
+    """
+
+    def __init__(self, output_dir: str, max_files: int = 100, refresh_interval: float = 1.0):
+        self.output_dir = output_dir
+        self.max_files = max_files
+        self.refresh_interval = refresh_interval
+        self.enabled = False
+        self.sample_rate = 0.0
+        self.match_header: Optional[str] = None
+        self.inline = False
+        self._lock = threading.Lock()
+        self._next_refresh = 0.0
+        self._settings_mtime: Optional[int] = None
+
+    def _apply(self, enabled: bool, sample_rate: float = 0.0, match_header: Optional[str] = None, inline: bool = False) -> None:
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.match_header = match_header.lower() if match_header else None
+        self.inline = inline
+
+    def configure(self, enabled: bool, sample_rate: float = 0.0, match_header: Optional[str] = None, inline: bool = False) -> None:
+        """Apply settings here and publish them to the other workers"""
+        self._apply(enabled, sample_rate, match_header, inline)
+        path = os.path.join(self.output_dir, SETTINGS_FILE)
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump(self.settings(refresh=False), f)
+            os.replace(temp_path, path)
+            self._settings_mtime = os.stat(path).st_mtime_ns
+        except OSError as e:
+            logger.error(f"Could not share profiling settings, they apply to this worker only: {str(e)}")
+        logger.info(f"Profiling {'enabled' if enabled else 'disabled'}: sample_rate={sample_rate} match_header={match_header} inline={inline}")
+
+    def refresh(self, force: bool = False) -> None:
+        """Reload settings.json if another worker changed it; stats the file at most once per refresh_interval"""
+        now = time.monotonic()
+        if not force and now < self._next_refresh:
+            return
+        self._next_refresh = now + self.refresh_interval
+        path = os.path.join(self.output_dir, SETTINGS_FILE)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+            if mtime == self._settings_mtime:
+                return
+            with open(path) as f:
+                settings: Dict[str, Any] = json.load(f)
+            self._apply(bool(settings["enabled"]), float(settings["sample_rate"]), settings["match_header"], bool(settings["inline"]))
+            self._settings_mtime = mtime
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.error(f"Could not load profiling settings: {str(e)}")
+
+    def settings(self, refresh: bool = True) -> dict:
+        if refresh:
+            self.refresh(force=True)
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "match_header": self.match_header,
+            "inline": self.inline,
+        }
+
+    def start(self, headers: Mapping[str, str]) -> Optional[ProfileCapture]:
+        """Begin a capture for this request, or return None if it should not be profiled"""
+        self.refresh()
+        if not self.enabled:
+            return None
+        matched = bool(self.match_header) and self.match_header in headers
+        if not matched and not (self.sample_rate > 0 and random.random() < self.sample_rate):
+            return None
+        # One capture at a time; concurrent candidates are simply not profiled
+        if not self._lock.acquire(blocking=False):
+            return None
+        return ProfileCapture(inline=self.inline and matched)
+
+    def finish(self, capture: Optional[ProfileCapture]) -> None:
+        if capture is not None:
+            self._lock.release()
+
+    def save(self, capture: ProfileCapture, label: str) -> Optional[str]:
+        """Write the profile (and its label and timings) to disk and return its id, or None if it could not be saved"""
+        if capture.failed:
+            return None
+        profile_id = uuid.uuid4().hex
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            with open(os.path.join(self.output_dir, f"{profile_id}.json"), "w") as f:
+                json.dump({"label": label, "timings": capture.timings}, f)
+            capture.profile.dump_stats(os.path.join(self.output_dir, f"{profile_id}.prof"))
+            self._prune()
+        except Exception as e:
+            logger.error(f"Could not save profile: {str(e)}")
+            return None
+        logger.info(f"Saved profile {profile_id} for {label} at {time.strftime('%Y-%m-%dT%H:%M:%S')}")
+        return profile_id
+
+    def _prune(self) -> None:
+        """Delete the oldest profiles beyond max_files"""
+        paths = sorted(glob.glob(os.path.join(self.output_dir, "*.prof")), key=os.path.getmtime)
+        for path in paths[:max(0, len(paths) - self.max_files)]:
+            for victim in (path, path[:-len(".prof")] + ".json"):
+                try:
+                    os.remove(victim)
+                except OSError:
+                    pass
+
+    def path_for(self, profile_id: str) -> Optional[str]:
+        if not PROFILE_ID_PATTERN.match(profile_id):
+            return None
+        path = os.path.join(self.output_dir, f"{profile_id}.prof")
+        return path if os.path.exists(path) else None
+
+    def describe(self, profile_id: str, limit: int = 40) -> Optional[str]:
+        """A saved profile as text: its label and timings, then the stats"""
+        path = self.path_for(profile_id)
+        if not path:
+            return None
+        lines = []
+        try:
+            with open(path[:-len(".prof")] + ".json") as f:
+                meta = json.load(f)
+            lines.append(meta["label"])
+            lines.extend(f"{name}: {seconds * 1000:.2f} ms" for name, seconds in meta["timings"].items())
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"No metadata for profile {profile_id}: {str(e)}")
+        return "\n".join(lines + [format_stats(path, limit)])
+
+
+def format_stats(source, limit: int = 40) -> str:
+    """Render a profile (or path to a .prof file) as text sorted by cumulative time"""
+    stream = io.StringIO()
+    stats = pstats.Stats(source, stream=stream)
+    stats.sort_stats('cumulative').print_stats(limit)
+    return stream.getvalue()
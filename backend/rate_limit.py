@@ -0,0 +1,176 @@
+from collections import OrderedDict
+from typing import Dict, Iterable, NamedTuple, Optional, Sequence, Tuple
+import json
+import logging
+import math
+import time
+
+from starlette.datastructures import Headers
+
+try:
+    import redis.asyncio as redis
+except ImportError:  # optional dependency, only needed for the shared backend
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimit(NamedTuple):
+    rate: float  # tokens added per second
+    burst: int  # bucket capacity
+
+
+def check_limit(limit: RateLimit) -> RateLimit:
+    """Reject limits that would never refill (and never expire in Redis)"""
+    if not limit.rate > 0:
+        raise ValueError(f"Rate limit rate must be positive, got {limit.rate}")
+    if limit.burst < 1:
+        raise ValueError(f"Rate limit burst must be at least 1, got {limit.burst}")
+    return limit
+
+
+def refill(tokens: float, updated: float, now: float, limit: RateLimit) -> float:
+    """Tokens in a bucket at `now`, given its level at `updated`"""
+    return min(limit.burst, tokens + (now - updated) * limit.rate)
+
+
+def retry_after(tokens: float, limit: RateLimit) -> float:
+    """Seconds until a bucket holding `tokens` can pay for one request"""
+    return (1 - tokens) / limit.rate if limit.rate > 0 else math.inf
+
+
+class InMemoryBackend:
+    """Per-worker token buckets: O(1) per check, LRU-bounded key count.
+
+    Also serves as a local stand-in for RedisBackend in tests: both expose the
+    same async `take` and apply the same bucket arithmetic.
+    """
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def take(self, key: str, limit: RateLimit, now: Optional[float] = None) -> Tuple[bool, float]:
+        now = time.monotonic() if now is None else now
+        bucket = self._buckets.get(key)
+        tokens = refill(bucket[0], bucket[1], now, limit) if bucket else float(limit.burst)
+
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        if len(self._buckets) > self.max_keys:
+            # Evicted buckets come back full, which is what an idle client would have anyway
+            self._buckets.popitem(last=False)
+        return allowed, 0.0 if allowed else retry_after(tokens, limit)
+
+
+# Same arithmetic as InMemoryBackend, run atomically inside Redis.
+# Uses the Redis server clock so all workers and nodes agree on time.
+REDIS_TAKE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = burst
+if bucket[1] then
+    tokens = math.min(burst, tonumber(bucket[1]) + (now - tonumber(bucket[2])) * rate)
+end
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisBackend:
+    """Token buckets shared by every worker and node talking to one Redis"""
+
+    def __init__(self, url: Optional[str] = None, prefix: str = "ratelimit:", client=None):
+        if client is None:
+            if redis is None:
+                raise RuntimeError("The redis package is required for the shared rate limit backend")
+            client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self._client = client
+        self._script = self._client.register_script(REDIS_TAKE_SCRIPT)
+
+    async def take(self, key: str, limit: RateLimit, now: Optional[float] = None) -> Tuple[bool, float]:
+        allowed, tokens = await self._script(keys=[self.prefix + key], args=[limit.rate, limit.burst])
+        return bool(allowed), 0.0 if allowed else retry_after(float(tokens), limit)
+
+
+def parse_limits(spec: str) -> Dict[str, RateLimit]:
+    """Parse per-key overrides of the form 'key=rate/burst,key2=rate/burst'"""
+    limits = {}
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        key, _, value = entry.partition("=")
+        rate, _, burst = value.partition("/")
+        limits[key.strip()] = check_limit(RateLimit(float(rate), int(burst or max(1, math.ceil(float(rate))))))
+    return limits
+
+
+class RateLimitMiddleware:
+    """ASGI middleware applying a token bucket per API key (or client IP).
+
+    Only keys in `api_keys` or `limits` get their own bucket; any other key is
+    ignored and the request is limited by client IP, so rotating made-up keys
+    does not buy extra quota. The IP comes from the ASGI scope, so behind a
+    reverse proxy the server must rewrite it from the forwarded headers.
+
+    Written as plain ASGI rather than BaseHTTPMiddleware so a check costs one
+    bucket update and no extra task or body buffering.
+    """
+
+    def __init__(self, app, backend, default_limit: RateLimit, limits: Optional[Dict[str, RateLimit]] = None,
+                 paths: Sequence[str] = ("/",), key_header: str = "x-api-key", api_keys: Iterable[str] = ()):
+        self.app = app
+        self.backend = backend
+        self.default_limit = check_limit(default_limit)
+        self.limits = {key: check_limit(limit) for key, limit in (limits or {}).items()}
+        self.api_keys = frozenset(api_keys) | frozenset(self.limits)
+        self.paths = tuple(paths)
+        self.key_header = key_header
+
+    def client_key(self, scope) -> str:
+        api_key = Headers(scope=scope).get(self.key_header)
+        if api_key and api_key in self.api_keys:
+            return f"key:{api_key}"
+        client = scope.get("client")
+        return f"ip:{client[0] if client else 'unknown'}"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "OPTIONS" or not scope["path"].startswith(self.paths):
+            await self.app(scope, receive, send)
+            return
+
+        key = self.client_key(scope)
+        limit = self.limits.get(key[4:] if key.startswith("key:") else key, self.default_limit)
+        try:
+            allowed, wait = await self.backend.take(key, limit)
+        except Exception as e:
+            # Fail open: a broken shared backend must not take the API down
+            logger.error(f"Rate limit backend error: {str(e)}")
+            allowed, wait = True, 0.0
+
+        if allowed:
+            await self.app(scope, receive, send)
+            return
+
+        body = json.dumps({"detail": "Rate limit exceeded"}).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, math.ceil(min(wait, 3600)))).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
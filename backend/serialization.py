@@ -0,0 +1,43 @@
+from fastapi.responses import JSONResponse
+from typing import Any, Dict, Iterable
+import json
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+DRUG_RESPONSE_FIELDS = ('drugs', 'safe', 'interaction_message', 'friendly_response', 'interactions')
+DRUG_INFO_FIELDS = ('name', 'info', 'side_effects', 'warnings', 'is_safe')
+
+
+def dumps_json(content: Any) -> bytes:
+    """Encode JSON with orjson when available, falling back to the stdlib"""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def project_fields(data: Dict[str, Any], fields: Iterable[str]) -> Dict[str, Any]:
+    return {field: data[field] for field in fields}
+
+
+def project_drug_response(response: Dict[str, Any]) -> Dict[str, Any]:
+    """Trim a pipeline result to the DrugResponse/DrugInfo shape without re-validating it.
+
+    Mirrors the field filtering FastAPI applies through response_model, so the
+    fast path emits exactly the same JSON document as the validated one.
+    """
+    projected = project_fields(response, DRUG_RESPONSE_FIELDS)
+    projected['drugs'] = [project_fields(drug, DRUG_INFO_FIELDS) for drug in response['drugs']]
+    return projected
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response for trusted internal data: no validation, fast encoder"""
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            # Already encoded (e.g. served from the encoded-response cache)
+            return content
+        return dumps_json(content)
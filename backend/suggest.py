@@ -0,0 +1,93 @@
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Set, Tuple
+import threading
+
+from fda_api import COMMON_DRUG_INFO, DRUG_ALIASES
+
+# Shortest prefix for which typo-tolerant matching kicks in
+MIN_FUZZY_PREFIX = 3
+
+
+def _deletions(term: str) -> Set[str]:
+    """All strings obtained by deleting one character from term"""
+    return {term[:i] + term[i + 1:] for i in range(len(term))}
+
+
+def _alias_rank(alias: str, drug_id: str) -> Tuple[bool, int, int, str]:
+    """Sort key for display names: the drug's own name first, then the shortest alias,
+    preferring the spaced spelling ('birth control') over the run-together one ('birthcontrol')"""
+    return (alias != drug_id.replace('_', ' '), len(alias.replace(' ', '')), -alias.count(' '), alias)
+
+
+class DrugSuggester:
+    """Autocomplete over every known drug alias.
+
+    Exact prefixes are answered from a sorted alias array with binary search.
+    When nothing matches, prefixes within one edit (insert, delete, substitute
+    or swap a character) are resolved through a precomputed deletion index.
+    Results are ranked by popularity, seeded from how many interactions a drug
+    has and bumped as drugs are queried.
+    """
+
+    def __init__(self, aliases: Dict[str, str]):
+        pairs = sorted(aliases.items())
+        self._keys = [alias for alias, _ in pairs]
+        self._ids = [drug_id for _, drug_id in pairs]
+
+        self._fuzzy: Dict[str, Set[int]] = defaultdict(set)
+        for index, alias in enumerate(self._keys):
+            for length in range(MIN_FUZZY_PREFIX, len(alias) + 1):
+                prefix = alias[:length]
+                self._fuzzy[prefix].add(index)
+                for variant in _deletions(prefix):
+                    self._fuzzy[variant].add(index)
+
+        self._popularity: Counter = Counter()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_knowledge_base(cls) -> "DrugSuggester":
+        aliases = {alias: drug_id for alias, drug_id in DRUG_ALIASES.items() if drug_id in COMMON_DRUG_INFO}
+        for drug_id in COMMON_DRUG_INFO:
+            aliases.setdefault(drug_id.replace('_', ' '), drug_id)
+        suggester = cls(aliases)
+        for drug_id, info in COMMON_DRUG_INFO.items():
+            suggester._popularity[drug_id] = len(info.get('interactions', {}))
+        return suggester
+
+    def record(self, drug_ids: Iterable[str]) -> None:
+        """Count a lookup of these drugs towards their popularity"""
+        with self._lock:
+            self._popularity.update(drug_ids)
+
+    def _prefix_matches(self, prefix: str) -> List[int]:
+        lo = bisect_left(self._keys, prefix)
+        hi = bisect_left(self._keys, prefix + '\uffff', lo)
+        return list(range(lo, hi))
+
+    def _fuzzy_matches(self, prefix: str) -> List[int]:
+        matches: Set[int] = set()
+        for variant in _deletions(prefix) | {prefix}:
+            matches.update(self._fuzzy.get(variant, ()))
+        return sorted(matches)
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Dict[str, str]]:
+        prefix = ' '.join(prefix.lower().split())
+        if not prefix:
+            return []
+
+        matches = self._prefix_matches(prefix)
+        if not matches and len(prefix) >= MIN_FUZZY_PREFIX:
+            matches = self._fuzzy_matches(prefix)
+
+        # One suggestion per drug, using its best matching alias
+        best: Dict[str, Tuple[bool, int, int, str]] = {}
+        for index in matches:
+            alias, drug_id = self._keys[index], self._ids[index]
+            rank = _alias_rank(alias, drug_id)
+            if drug_id not in best or rank < best[drug_id]:
+                best[drug_id] = rank
+
+        ranked = sorted(best, key=lambda drug_id: (-self._popularity[drug_id], best[drug_id]))
+        return [{'id': drug_id, 'name': best[drug_id][-1]} for drug_id in ranked[:limit]]
@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+
+from admission import AdmissionController, Overloaded, PRIORITY_CACHED, PRIORITY_ENRICH
+
+
+def test_rejects_when_queue_full():
+    async def scenario():
+        controller = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout=1.0)
+        await controller.acquire()
+        waiter = asyncio.ensure_future(controller.acquire())
+        await asyncio.sleep(0)
+        with pytest.raises(Overloaded):
+            await controller.acquire()
+        controller.release()
+        await waiter
+        assert controller.active == 1
+        controller.release()
+        assert controller.active == 0
+
+    asyncio.run(scenario())
+
+
+def test_queue_deadline():
+    async def scenario():
+        controller = AdmissionController(max_concurrent=1, max_queue=4, queue_timeout=0.01)
+        await controller.acquire()
+        with pytest.raises(Overloaded):
+            await controller.acquire()
+        assert controller.queued == 0
+
+    asyncio.run(scenario())
+
+
+def test_cached_requests_served_first():
+    async def scenario():
+        controller = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout=1.0)
+        order = []
+
+        async def request(name, priority):
+            async with controller.slot(priority):
+                order.append(name)
+
+        await controller.acquire()
+        slow = asyncio.ensure_future(request("slow", PRIORITY_ENRICH))
+        await asyncio.sleep(0)
+        # Queue is full: the cached request displaces the slow one
+        cached = asyncio.ensure_future(request("cached", PRIORITY_CACHED))
+        await asyncio.sleep(0)
+        controller.release()
+        await cached
+        with pytest.raises(Overloaded):
+            await slow
+        assert order == ["cached"]
+
+    asyncio.run(scenario())
+
+
+def test_make_room_skips_finished_waiters():
+    async def scenario():
+        controller = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout=1.0)
+        await controller.acquire()
+        # A waiter whose deadline fired but which has not cleaned up after itself yet
+        stale = asyncio.get_running_loop().create_future()
+        stale.cancel()
+        controller._waiters.append((PRIORITY_ENRICH, -1, stale))
+        waiter = asyncio.ensure_future(controller.acquire(PRIORITY_CACHED))
+        await asyncio.sleep(0)
+        assert controller.queued == 1
+        controller.release()
+        await waiter
+
+    asyncio.run(scenario())
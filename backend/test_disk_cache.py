@@ -0,0 +1,101 @@
+import multiprocessing
+import os
+import stat
+import time
+from types import SimpleNamespace
+
+import fda_api
+from cache import LRUCache, TieredCache
+from disk_cache import DiskCache
+
+def _write_from_other_process(path):
+    DiskCache(path).put('shared', {'from': 'child'})
+
+def test_disk_cache_ttl(tmp_path):
+    cache = DiskCache(os.path.join(tmp_path, 'cache.sqlite3'))
+    cache.put('fresh', [True, 'ok'])
+    cache.put('stale', 'old', ttl=-1)
+    assert cache.get('fresh') == [True, 'ok']
+    assert cache.get('stale') is None
+    assert cache.get('missing', 'default') == 'default'
+
+def test_disk_cache_evicts_least_recently_read(tmp_path):
+    cache = DiskCache(os.path.join(tmp_path, 'cache.sqlite3'), max_bytes=30, evict_every=1000, touch_interval=0)
+    cache.put('a', 'x' * 10)
+    cache.put('b', 'y' * 10)
+    cache.get('a')
+    cache.put('c', 'z' * 10)
+    cache.evict()
+    assert cache.get('a') is not None
+    assert cache.get('b') is None
+    assert cache.get('c') is not None
+
+def test_disk_cache_shared_between_processes(tmp_path):
+    path = os.path.join(tmp_path, 'cache.sqlite3')
+    cache = DiskCache(path)
+    process = multiprocessing.get_context('spawn').Process(target=_write_from_other_process, args=(path,))
+    process.start()
+    process.join(10)
+    assert process.exitcode == 0
+    assert cache.get('shared') == {'from': 'child'}
+
+def test_tiered_cache_promotes_from_store(tmp_path):
+    store = DiskCache(os.path.join(tmp_path, 'cache.sqlite3'))
+    store.put('key', 'value')
+    cache = TieredCache(LRUCache(maxsize=4), store)
+    assert cache.get('key') == 'value'
+    assert 'key' in cache.memory
+
+def test_tiered_cache_expires_from_memory(tmp_path):
+    store = DiskCache(os.path.join(tmp_path, 'cache.sqlite3'))
+    cache = TieredCache(LRUCache(maxsize=4), store)
+    cache.put('key', 'stale', ttl=0.05)
+    assert cache.get('key') == 'stale'
+    time.sleep(0.1)
+    # The memory tier is warm but must not outlive the TTL
+    assert 'key' not in cache.memory
+    assert cache.get('key') is None
+
+def test_disk_cache_is_private(tmp_path):
+    path = os.path.join(tmp_path, 'private', 'cache.sqlite3')
+    DiskCache(path).put('key', 'value')
+    assert stat.S_IMODE(os.stat(os.path.dirname(path)).st_mode) == 0o700
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+def test_tiered_cache_memory_follows_store_default_ttl(tmp_path):
+    store = DiskCache(os.path.join(tmp_path, 'cache.sqlite3'), default_ttl=0.05)
+    cache = TieredCache(LRUCache(maxsize=4), store)
+    cache.put('key', 'value')
+    time.sleep(0.1)
+    assert cache.get('key') is None
+
+def test_disk_cache_reads_do_not_write(tmp_path):
+    cache = DiskCache(os.path.join(tmp_path, 'cache.sqlite3'), touch_interval=60)
+    cache.put('key', 'value')
+    query = "SELECT accessed_at FROM entries WHERE key = 'key'"
+    accessed_at = cache._connection().execute(query).fetchone()[0]
+    assert cache.get('key') == 'value'
+    assert cache._connection().execute(query).fetchone()[0] == accessed_at
+
+def test_ai_analysis_served_from_disk(tmp_path, monkeypatch):
+    calls = []
+
+    def create(**kwargs):
+        calls.append(kwargs)
+        message = SimpleNamespace(content='Generally safe; monitor for stomach upset.')
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(fda_api, 'get_openai_client', lambda: client)
+    path = os.path.join(tmp_path, 'cache.sqlite3')
+
+    monkeypatch.setattr(fda_api, '_enrichment_cache', TieredCache(LRUCache(maxsize=4), DiskCache(path)))
+    first = fda_api.analyze_with_ai(['warfarin', 'ibuprofen'])
+    assert fda_api.analyze_with_ai(['ibuprofen', 'warfarin']) == first
+    assert len(calls) == 1
+
+    # A fresh process with a cold memory tier is answered from the shared file
+    monkeypatch.setattr(fda_api, '_enrichment_cache', TieredCache(LRUCache(maxsize=4), DiskCache(path)))
+    assert fda_api.analyze_with_ai(['warfarin', 'ibuprofen']) == first
+    assert len(calls) == 1
+    assert first == (True, 'Generally safe; monitor for stomach upset.')
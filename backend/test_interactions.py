@@ -0,0 +1,39 @@
+from fda_api import (
+    Severity, build_interaction_matrix, check_drug_interaction, get_drug_interaction, get_interactions,
+    parse_interaction
+)
+
+def test_parse_interaction():
+    interaction = parse_interaction('ibuprofen', 'alcohol', 'WARNING: Drinking alcohol while taking ibuprofen can increase your risk of stomach bleeding. Limit alcohol consumption.')
+    assert interaction.severity == Severity.WARNING
+    assert interaction.mechanism == 'Drinking alcohol while taking ibuprofen can increase your risk of stomach bleeding.'
+    assert interaction.recommendation == 'Limit alcohol consumption.'
+
+    assert parse_interaction('a', 'b', 'CAUTION: May increase metformin levels.').severity == Severity.CAUTION
+    assert parse_interaction('a', 'b', 'No significant interaction').severity == Severity.NONE
+
+def test_get_interactions_sorted_and_filtered():
+    interactions = get_interactions(['sertraline', 'ibuprofen', 'warfarin'])
+    assert [i.severity for i in interactions] == [Severity.WARNING, Severity.CAUTION]
+    assert len(get_interactions(['sertraline', 'ibuprofen', 'warfarin'], Severity.WARNING)) == 1
+
+def test_check_drug_interaction_uses_severity():
+    is_safe, message = check_drug_interaction(['ibuprofen', 'warfarin'])
+    assert not is_safe
+    assert 'WARNINGS:' in message
+    is_safe, message = check_drug_interaction(['ibuprofen', 'sertraline'])
+    assert is_safe
+    assert 'CAUTIONS:' in message
+
+def test_build_interaction_matrix():
+    matrix = build_interaction_matrix(['ibuprofen', 'warfarin', 'sertraline'])
+    assert matrix['severity'] == [[0, 2, 1], [2, 0, 0], [1, 0, 0]]
+    assert matrix['message_ids'][0][1] == matrix['message_ids'][1][0]
+    assert matrix['message_ids'][1][2] == -1
+    assert len(matrix['messages']) == 2
+    assert matrix['severity_labels'][Severity.WARNING] == 'high'
+
+def test_get_drug_interaction_alcohol():
+    result = get_drug_interaction('beer', 'advil')
+    assert result['severity'] == 'high'
+    assert not result['is_safe']
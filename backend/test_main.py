@@ -0,0 +1,177 @@
+from fastapi.testclient import TestClient
+
+import json
+import time
+
+from main import DrugResponse, app, build_drug_response, canonical_drug_key
+from serialization import dumps_json, project_drug_response
+
+client = TestClient(app)
+
+def test_get_check_interactions_redirects_to_canonical_url():
+    response = client.get('/check-interactions?drugs=zoloft,advil', follow_redirects=False)
+    assert response.status_code == 308
+    assert response.headers['location'].endswith('drugs=ibuprofen%2Csertraline')
+
+def test_get_check_interactions_conditional_request():
+    response = client.get('/check-interactions?drugs=ibuprofen,sertraline')
+    assert response.status_code == 200
+    assert 'public' in response.headers['cache-control']
+    etag = response.headers['etag']
+
+    response = client.get('/check-interactions?drugs=ibuprofen,sertraline', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.headers['etag'] == etag
+
+def test_get_check_interactions_unknown_drug():
+    response = client.get('/check-interactions?drugs=nonexistentdrug123')
+    assert response.status_code == 400
+
+def test_fast_serialization_matches_validated_response():
+    result = build_drug_response(canonical_drug_key(['sertraline', 'ibuprofen']))
+    validated = DrugResponse.model_validate(result).model_dump()
+    assert json.loads(dumps_json(project_drug_response(result))) == validated
+
+def test_profiling_admin_requires_token():
+    response = client.put('/admin/profiling', json={'enabled': True, 'sample_rate': 1.0})
+    assert response.status_code == 403
+
+def test_min_severity_filters_interactions():
+    response = client.get('/check-interactions?drugs=ibuprofen,sertraline,warfarin&min_severity=high')
+    assert response.status_code == 200
+    assert [i['severity'] for i in response.json()['interactions']] == ['high']
+
+def test_interaction_matrix():
+    response = client.post('/interactions/matrix', json={'drugs': ['advil', 'coumadin', 'ibuprofen']})
+    assert response.status_code == 200
+    data = response.json()
+    assert data['drugs'] == ['ibuprofen', 'warfarin']
+    assert data['severity'] == [[0, 2], [2, 0]]
+
+    response = client.post('/interactions/matrix', json={'drugs': ['nonexistentdrug123']})
+    assert response.status_code == 400
+
+def test_ready_after_warm_up():
+    assert client.get('/health').status_code == 200
+    with TestClient(app) as started:
+        for _ in range(100):
+            if started.get('/ready').status_code == 200:
+                break
+            time.sleep(0.05)
+        response = started.get('/ready')
+        assert response.status_code == 200
+        assert response.json()['warmup_seconds'] is not None
+
+def test_check_interactions_returns_503_when_saturated(monkeypatch):
+    import main
+
+    controller = main.AdmissionController(max_concurrent=1, max_queue=0, queue_timeout=0.01, retry_after=7)
+    controller._active = 1  # Every slot is taken by an in-flight request
+    monkeypatch.setattr(main, 'admission', controller)
+
+    response = client.post('/check-interactions', json={'query': 'advil and zoloft'})
+    assert response.status_code == 503
+    assert response.headers['retry-after'] == '7'
+
+def test_etag_changes_with_response_version(monkeypatch):
+    import main
+
+    etag = main.response_etag(('ibuprofen',))
+    assert etag.startswith('W/')
+    monkeypatch.setattr(main, 'RESPONSE_VERSION', 'changed')
+    assert main.response_etag(('ibuprofen',)) != etag
+
+def test_profiling_with_admin_token(monkeypatch, tmp_path):
+    import main
+
+    monkeypatch.setattr(main, 'ADMIN_TOKEN', 'secret')
+    monkeypatch.setattr(main, 'profiler', main.RequestProfiler(str(tmp_path)))
+    admin = {'X-Admin-Token': 'secret'}
+    response = client.put('/admin/profiling', headers=admin,
+                          json={'enabled': True, 'sample_rate': 1.0, 'match_header': 'X-Profile', 'inline': True})
+    assert response.status_code == 200
+
+    # Sampled requests keep their normal body even with inline stats on
+    response = client.post('/check-interactions', json={'query': 'advil and zoloft'})
+    assert response.status_code == 200
+    assert response.json()['drugs']
+    profile_id = response.headers['x-profile-id']
+
+    assert 'admission;dur=' in response.headers['server-timing']
+
+    response = client.get(f'/admin/profiles/{profile_id}', headers=admin)
+    assert response.status_code == 200
+    assert 'admission:' in response.text
+    # Rendering and response_model validation are part of the profile too
+    assert 'build_drug_response' in response.text
+    assert 'render_validated_response' in response.text
+
+    # Only requests carrying the match header get the stats inline
+    response = client.get('/check-interactions?drugs=ibuprofen,sertraline', headers={'X-Profile': '1'})
+    assert response.status_code == 200
+    assert 'build_drug_response' in response.text
+    assert response.headers['x-profile-id']
+
+def test_profiling_skipped_while_another_capture_runs(monkeypatch, tmp_path):
+    import main
+
+    profiler = main.RequestProfiler(str(tmp_path))
+    profiler.configure(True, sample_rate=1.0)
+    monkeypatch.setattr(main, 'profiler', profiler)
+    capture = profiler.start({})
+    try:
+        response = client.get('/check-interactions?drugs=ibuprofen,sertraline')
+    finally:
+        profiler.finish(capture)
+    assert response.status_code == 200
+    assert 'x-profile-id' not in response.headers
+
+def test_profile_directory_is_capped(tmp_path):
+    from profiling import RequestProfiler
+
+    profiler = RequestProfiler(str(tmp_path), max_files=2)
+    profiler.configure(True, sample_rate=1.0)
+    for _ in range(4):
+        capture = profiler.start({})
+        capture.call(sum, [1, 2])
+        profiler.save(capture, 'test')
+        profiler.finish(capture)
+    assert len(list(tmp_path.glob('*.prof'))) == 2
+
+def test_profiling_settings_shared_between_workers(tmp_path):
+    from profiling import RequestProfiler
+
+    workers = [RequestProfiler(str(tmp_path), refresh_interval=0) for _ in range(2)]
+    workers[0].configure(True, sample_rate=1.0, match_header='X-Profile')
+    assert workers[1].settings()['match_header'] == 'x-profile'
+    capture = workers[1].start({})
+    assert capture is not None
+    workers[1].finish(capture)
+
+    workers[0].configure(False)
+    assert workers[1].start({}) is None
+
+def test_ner_fallback_goes_through_admission(monkeypatch):
+    import fda_api
+    import main
+
+    class StubNER:
+        enabled = True
+        calls = 0
+
+        def extract_mentions(self, text):
+            StubNER.calls += 1
+            return ['Zoloft']
+
+    monkeypatch.setattr(main, 'drug_ner', StubNER())
+    monkeypatch.setattr(fda_api, 'drug_ner', StubNER())
+    response = client.post('/check-interactions', json={'query': 'what about sertralyne'})
+    assert response.status_code == 200
+    assert StubNER.calls == 1
+
+    controller = main.AdmissionController(max_concurrent=1, max_queue=0, queue_timeout=0.01)
+    controller._active = 1
+    monkeypatch.setattr(main, 'admission', controller)
+    response = client.post('/check-interactions', json={'query': 'what about sertralyne'})
+    assert response.status_code == 503
+    assert StubNER.calls == 1
@@ -0,0 +1,67 @@
+import threading
+
+from ner import MicroBatcher
+import fda_api
+from fda_api import extract_drugs_from_query, resolve_drug_mention
+
+def test_micro_batcher_groups_concurrent_requests():
+    batch_sizes = []
+
+    def predict(texts):
+        batch_sizes.append(len(texts))
+        return [text.upper() for text in texts]
+
+    batcher = MicroBatcher(predict, max_batch=32, window=0.05)
+    results = {}
+    threads = [
+        threading.Thread(target=lambda i=i: results.__setitem__(i, batcher.submit(f"query {i}", timeout=2)))
+        for i in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == {i: f"QUERY {i}" for i in range(8)}
+    assert sum(batch_sizes) == 8
+    assert len(batch_sizes) < 8
+
+def test_resolve_drug_mention():
+    assert resolve_drug_mention('Zoloft') == 'sertraline'
+    assert resolve_drug_mention('ibuprofin') == 'ibuprofen'
+    assert resolve_drug_mention('nonexistentdrug123') == ''
+    assert resolve_drug_mention('Ibuprofin') == 'ibuprofen'
+
+def test_extract_drugs_from_query_passes_original_text_to_ner(monkeypatch):
+    class StubNER:
+        enabled = True
+
+        def __init__(self):
+            self.texts = []
+
+        def extract_mentions(self, text):
+            self.texts.append(text)
+            return ['Zolofft']
+
+    stub = StubNER()
+    monkeypatch.setattr(fda_api, 'drug_ner', stub)
+    assert extract_drugs_from_query('I take Zolofft daily') == ['sertraline']
+    assert stub.texts == ['I take Zolofft daily']
+
+def test_micro_batcher_fails_batch_on_missing_results():
+    batcher = MicroBatcher(lambda texts: [], max_batch=32, window=0.05)
+    errors = []
+
+    def submit(i):
+        try:
+            batcher.submit(f"query {i}", timeout=2)
+        except RuntimeError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=submit, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Every caller of a short batch gets an error instead of waiting out the timeout
+    assert len(errors) == 4
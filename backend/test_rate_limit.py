@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from rate_limit import InMemoryBackend, RateLimit, RateLimitMiddleware, RedisBackend, parse_limits
+
+def test_token_bucket_refills():
+    backend = InMemoryBackend()
+    limit = RateLimit(rate=1.0, burst=2)
+
+    async def scenario():
+        assert (await backend.take('a', limit, now=0.0))[0]
+        assert (await backend.take('a', limit, now=0.0))[0]
+        allowed, wait = await backend.take('a', limit, now=0.0)
+        assert not allowed and wait == 1.0
+        # Other keys have their own bucket
+        assert (await backend.take('b', limit, now=0.0))[0]
+        assert (await backend.take('a', limit, now=1.0))[0]
+
+    asyncio.run(scenario())
+
+def test_parse_limits():
+    assert parse_limits('partner=50/100, slow=0.5/2') == {
+        'partner': RateLimit(50.0, 100),
+        'slow': RateLimit(0.5, 2),
+    }
+    with pytest.raises(ValueError):
+        parse_limits('frozen=0/10')
+
+def test_middleware_limits_per_api_key():
+    app = FastAPI()
+
+    @app.get('/limited')
+    async def limited():
+        return {'ok': True}
+
+    app.add_middleware(
+        RateLimitMiddleware,
+        backend=InMemoryBackend(),
+        default_limit=RateLimit(0.001, 1),
+        limits={'partner': RateLimit(0.001, 3)},
+        paths=['/limited'],
+    )
+    client = TestClient(app)
+
+    assert client.get('/limited').status_code == 200
+    response = client.get('/limited')
+    assert response.status_code == 429
+    assert 'retry-after' in response.headers
+
+    statuses = [client.get('/limited', headers={'X-API-Key': 'partner'}).status_code for _ in range(4)]
+    assert statuses == [200, 200, 200, 429]
+
+def test_unknown_api_keys_share_the_ip_bucket():
+    app = FastAPI()
+
+    @app.get('/limited')
+    async def limited():
+        return {'ok': True}
+
+    app.add_middleware(
+        RateLimitMiddleware,
+        backend=InMemoryBackend(),
+        default_limit=RateLimit(0.001, 2),
+        paths=['/limited'],
+        api_keys=['known'],
+    )
+    client = TestClient(app)
+
+    statuses = [client.get('/limited', headers={'X-API-Key': f'made-up-{i}'}).status_code for i in range(3)]
+    assert statuses == [200, 200, 429]
+    assert client.get('/limited', headers={'X-API-Key': 'known'}).status_code == 200
+
+def test_redis_backend_shares_buckets():
+    fakeredis = pytest.importorskip('fakeredis')
+    pytest.importorskip('lupa')
+    server = fakeredis.FakeServer()
+    workers = [RedisBackend(client=fakeredis.FakeAsyncRedis(server=server)) for _ in range(2)]
+    limit = RateLimit(rate=0.001, burst=2)
+
+    async def scenario():
+        assert (await workers[0].take('a', limit))[0]
+        assert (await workers[1].take('a', limit))[0]
+        allowed, wait = await workers[0].take('a', limit)
+        assert not allowed and wait > 0
+        assert (await workers[1].take('b', limit))[0]
+        ttl = await workers[0]._client.ttl('ratelimit:a')
+        assert 0 < ttl <= 2001
+
+    asyncio.run(scenario())
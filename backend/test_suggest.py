@@ -0,0 +1,24 @@
+from suggest import DrugSuggester
+
+def test_suggest_prefix():
+    suggester = DrugSuggester({'advil': 'ibuprofen', 'ibuprofen': 'ibuprofen', 'aleve': 'naproxen'})
+    assert suggester.suggest('ib') == [{'id': 'ibuprofen', 'name': 'ibuprofen'}]
+    assert [s['id'] for s in suggester.suggest('a')] == ['ibuprofen', 'naproxen']
+    assert suggester.suggest('') == []
+
+def test_suggest_tolerates_typos():
+    suggester = DrugSuggester.from_knowledge_base()
+    assert suggester.suggest('setr')[0]['id'] == 'sertraline'
+    assert suggester.suggest('ibuprfen')[0]['id'] == 'ibuprofen'
+    assert suggester.suggest('xyzzy') == []
+
+def test_suggest_ranked_by_popularity():
+    suggester = DrugSuggester({'advil': 'ibuprofen', 'aleve': 'naproxen'})
+    suggester.record(['naproxen'])
+    assert [s['id'] for s in suggester.suggest('a')] == ['naproxen', 'ibuprofen']
+
+def test_suggest_prefers_readable_names():
+    suggester = DrugSuggester.from_knowledge_base()
+    assert suggester.suggest('birth')[0] == {'id': 'birth_control', 'name': 'birth control'}
+    suggester = DrugSuggester({'birthcontrol': 'pill', 'birth control': 'pill'})
+    assert suggester.suggest('birth') == [{'id': 'pill', 'name': 'birth control'}]
@@ -1,4 +1,4 @@
-import React, { useState } from 'react';
+import React, { useEffect, useState } from 'react';
 import {
     Box,
     Button,
@@ -14,7 +14,11 @@ import {
     CardBody,
     Heading,
     Select,
+    Wrap,
+    WrapItem,
 } from '@chakra-ui/react';
+import { suggestDrugs } from '../services/api';
+import type { DrugSuggestion } from '../services/api';
 
 interface DrugInfo {
     name: string;
@@ -39,14 +43,52 @@ const QUERY_TYPES = [
     { value: 'info', label: 'General Information' },
 ];
 
+// Autocomplete is cheap server-side, so only a light debounce is needed
+const SUGGEST_DEBOUNCE_MS = 150;
+const SUGGEST_MIN_CHARS = 2;
+
 const DrugInteractionForm: React.FC = () => {
     const [query, setQuery] = useState('');
     const [queryType, setQueryType] = useState('interaction');
     const [loading, setLoading] = useState(false);
     const [error, setError] = useState<string | null>(null);
     const [result, setResult] = useState<DrugResponse | null>(null);
+    const [suggestions, setSuggestions] = useState<DrugSuggestion[]>([]);
     const toast = useToast();
 
+    // Suggest drug names for the word currently being typed
+    useEffect(() => {
+        const lastWord = query.match(/\S*$/)?.[0] ?? '';
+        if (lastWord.length < SUGGEST_MIN_CHARS) {
+            setSuggestions([]);
+            return;
+        }
+
+        let cancelled = false;
+        const timer = setTimeout(async () => {
+            try {
+                const results = await suggestDrugs(lastWord, 5);
+                if (!cancelled) {
+                    setSuggestions(results.filter(s => s.name !== lastWord.toLowerCase()));
+                }
+            } catch {
+                if (!cancelled) {
+                    setSuggestions([]);
+                }
+            }
+        }, SUGGEST_DEBOUNCE_MS);
+
+        return () => {
+            cancelled = true;
+            clearTimeout(timer);
+        };
+    }, [query]);
+
+    const applySuggestion = (suggestion: DrugSuggestion) => {
+        setQuery(query.replace(/\S*$/, `${suggestion.name} `));
+        setSuggestions([]);
+    };
+
     const handleSubmit = async (e: React.FormEvent) => {
         e.preventDefault();
         setLoading(true);
@@ -132,6 +174,22 @@ const DrugInteractionForm: React.FC = () => {
                                     rows={3}
                                 />
 
+                                {suggestions.length > 0 && (
+                                    <Wrap spacing={2} width="100%">
+                                        {suggestions.map(suggestion => (
+                                            <WrapItem key={suggestion.id}>
+                                                <Button
+                                                    size="xs"
+                                                    variant="outline"
+                                                    onClick={() => applySuggestion(suggestion)}
+                                                >
+                                                    {suggestion.name}
+                                                </Button>
+                                            </WrapItem>
+                                        ))}
+                                    </Wrap>
+                                )}
+
                                 <Button
                                     type="submit"
                                     colorScheme="blue"
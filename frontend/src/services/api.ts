@@ -26,4 +26,22 @@ export const checkDrugInteractions = async (query: DrugQuery): Promise<DrugRespo
         console.error('Error in checkDrugInteractions:', error);
         throw error;
     }
-}; 
\ No newline at end of file
+};
+
+export interface DrugSuggestion {
+    id: string;
+    name: string;
+}
+
+// Per-keystroke autocomplete; cheap enough server-side for a light debounce.
+export const suggestDrugs = async (prefix: string, limit = 10): Promise<DrugSuggestion[]> => {
+    const params = new URLSearchParams({ prefix, limit: String(limit) });
+    const response = await fetch(`${API_URL}/drugs/suggest?${params}`);
+
+    if (!response.ok) {
+        return [];
+    }
+
+    const data = await response.json();
+    return data.suggestions;
+};